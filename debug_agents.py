@@ -4,53 +4,69 @@ Debug script to test agents one by one and identify issues.
 Run this from the project root to test individual agents.
 """
 
+import asyncio
+import aiohttp
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import orjson
+import sys
 import time
 
 API_KEY = "vth_hackathon_2025_secret_key"
 BASE_URL = "http://localhost:8000"
 
-def test_single_agent(agent_name: str, work_order: dict = None):
+DEFAULT_WORK_ORDER = {"brief": "test content", "bullets": ["concept1", "concept2"]}
+DEFAULT_WORK_ORDER_JSON = orjson.dumps(DEFAULT_WORK_ORDER).decode()
+AUTH_HEADERS = {"X-API-Key": API_KEY}
+
+# Shared session so synchronous calls reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.headers.update(AUTH_HEADERS)
+SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+async def test_single_agent_async(session: aiohttp.ClientSession, agent_name: str, work_order: dict = None):
     """Test a single agent with logging."""
     print(f"\n🧪 Testing {agent_name} agent...")
     
-    if work_order is None:
-        work_order = {"brief": "test content", "bullets": ["concept1", "concept2"]}
+    work_order_json = orjson.dumps(work_order).decode() if work_order is not None else DEFAULT_WORK_ORDER_JSON
     
+    start_time = time.time()
     try:
-        response = requests.post(
+        async with session.post(
             f"{BASE_URL}/api/test-single-agent",
-            headers={"X-API-Key": API_KEY},
+            headers=AUTH_HEADERS,
             data={
                 "agent_name": agent_name,
-                "test_work_order": json.dumps(work_order)
+                "test_work_order": work_order_json
             },
-            timeout=60  # 1 minute timeout
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            if result["status"] == "success":
-                print(f"✅ {agent_name} agent PASSED")
-                return True
+            timeout=aiohttp.ClientTimeout(total=60)  # 1 minute timeout
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                if result["status"] == "success":
+                    print(f"✅ {agent_name} agent PASSED")
+                    success = True
+                else:
+                    print(f"❌ {agent_name} agent FAILED: {result['error']}")
+                    success = False
             else:
-                print(f"❌ {agent_name} agent FAILED: {result['error']}")
-                return False
-        else:
-            print(f"❌ {agent_name} agent HTTP ERROR: {response.status_code}")
-            print(response.text)
-            return False
+                print(f"❌ {agent_name} agent HTTP ERROR: {response.status}")
+                print(await response.text())
+                success = False
             
-    except requests.exceptions.Timeout:
+    except asyncio.TimeoutError:
         print(f"⏱️ {agent_name} agent TIMEOUT (>60s)")
-        return False
+        success = False
     except Exception as e:
         print(f"🚨 {agent_name} agent EXCEPTION: {str(e)}")
-        return False
+        success = False
+    
+    elapsed = time.time() - start_time
+    print(f"⏱️ {agent_name}: {elapsed:.2f}s")
+    return {"success": success, "time": elapsed}
 
 def test_all_agents():
-    """Test all agents individually."""
+    """Test all agents concurrently in a single batched request."""
     agents = [
         "video_generation",
         "explanation", 
@@ -62,20 +78,30 @@ def test_all_agents():
         "quiz_generation"
     ]
     
-    results = {}
+    start_time = time.time()
+    try:
+        response = SESSION.post(
+            f"{BASE_URL}/api/test-all-agents",
+            json={"agents": agents, "work_order": DEFAULT_WORK_ORDER},
+            timeout=120  # agents run concurrently server-side
+        )
+        response.raise_for_status()
+        batch_results = response.json()["results"]
+    except Exception as e:
+        print(f"🚨 Batch agent test EXCEPTION: {str(e)}")
+        batch_results = {}
+    total_time = time.time() - start_time
     
+    results = {}
     for agent in agents:
-        start_time = time.time()
-        success = test_single_agent(agent)
-        elapsed = time.time() - start_time
-        
+        result = batch_results.get(agent, {"status": "failed", "error": "No result returned"})
+        success = result.get("status") == "success"
+        if not success:
+            print(f"❌ {agent} agent FAILED: {result.get('error')}")
         results[agent] = {
             "success": success,
-            "time": elapsed
+            "time": result.get("execution_time", 0.0)
         }
-        
-        print(f"⏱️ {agent}: {elapsed:.2f}s")
-        time.sleep(1)  # Brief pause between tests
     
     print("\n📊 SUMMARY:")
     print("=" * 50)
@@ -83,7 +109,7 @@ def test_all_agents():
     passed = sum(1 for r in results.values() if r["success"])
     total = len(results)
     
-    print(f"Overall: {passed}/{total} agents passed")
+    print(f"Overall: {passed}/{total} agents passed in {total_time:.2f}s wall time")
     
     for agent, result in results.items():
         status = "✅ PASS" if result["success"] else "❌ FAIL"
@@ -91,10 +117,15 @@ def test_all_agents():
     
     return results
 
+async def test_one_agent(agent_name: str):
+    """Test one agent through /api/test-single-agent."""
+    async with aiohttp.ClientSession() as session:
+        return await test_single_agent_async(session, agent_name)
+
 def check_server():
     """Check if server is running."""
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = SESSION.get(f"{BASE_URL}/health")
         if response.status_code == 200:
             print("✅ Server is running")
             return True
@@ -114,6 +145,10 @@ if __name__ == "__main__":
         print("cd image && python src/main.py")
         exit(1)
     
+    if len(sys.argv) == 3 and sys.argv[1] == "--single":
+        result = asyncio.run(test_one_agent(sys.argv[2]))
+        exit(0 if result["success"] else 1)
+    
     print("\n🚀 Starting agent tests...")
     results = test_all_agents()
     
@@ -1,4 +1,3 @@
-import json
 from typing import Dict, Any
 from .base_agent import BaseContentAgent
 
@@ -57,10 +56,10 @@ class ApplicationAgent(BaseContentAgent):
         
         try:
             response = await self._call_gemini(prompt)
-            result = json.loads(self._strip_code_fences(response))
+            result = self._parse_json_response(response)
             result["agent"] = "application"
             return result
-        except:
+        except Exception:
             return {
                 "agent": "application",
                 "real_world_applications": [{"application": "Practical use in industry", "description": "How this concept applies in professional settings", "industry": user_context.get("major", "Various fields"), "example_scenario": "Real-world scenario", "connection_to_concept": "Direct application of learned concepts"}],
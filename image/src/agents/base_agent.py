@@ -1,10 +1,23 @@
+import asyncio
+import logging
 import os
 import time
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
 import google.genai as genai
+import orjson
 import threading
 
+logger = logging.getLogger(__name__)
+
+# Process-wide cache of Gemini replies keyed by sha256(model + prompt)
+PROMPT_CACHE_TTL_SECONDS = 600
+PROMPT_CACHE_MAX_ENTRIES = 512
+_PROMPT_CACHE: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+_INFLIGHT_PROMPTS: Dict[str, "asyncio.Future[str]"] = {}
+
 
 class GeminiAPIKeyManager:
     """
@@ -28,7 +41,7 @@ class GeminiAPIKeyManager:
             self.current_index = 0
             self.usage_lock = threading.Lock()
             self.initialized = True
-            print(f"🔑 GeminiAPIKeyManager initialized with {len(self.api_keys)} API keys")
+            logger.info("🔑 GeminiAPIKeyManager initialized with %d API keys", len(self.api_keys))
     
     def _load_api_keys(self) -> List[str]:
         """Load all available API keys from environment variables."""
@@ -57,9 +70,9 @@ class GeminiAPIKeyManager:
             try:
                 client = genai.Client(api_key=api_key, vertexai=False)
                 clients.append(client)
-                print(f"✅ API key {i+1} client created successfully")
+                logger.info("✅ API key %d client created successfully", i + 1)
             except Exception as e:
-                print(f"❌ Failed to create client for API key {i+1}: {str(e)}")
+                logger.error("❌ Failed to create client for API key %d: %s", i + 1, e)
         
         if not clients:
             raise ValueError("No valid Gemini clients could be created")
@@ -72,7 +85,7 @@ class GeminiAPIKeyManager:
             client = self.clients[self.current_index]
             key_index = self.current_index + 1
             self.current_index = (self.current_index + 1) % len(self.clients)
-            print(f"🔄 Using API key {key_index}/{len(self.clients)}")
+            logger.debug("🔄 Using API key %d/%d", key_index, len(self.clients))
             return client
     
     def get_client_count(self) -> int:
@@ -87,11 +100,16 @@ class BaseContentAgent(ABC):
     Provides common functionality like Gemini client access and standardized interfaces.
     """
     
+    # Per-agent time budget (seconds) enforced by the orchestrator
+    max_duration: float = 60
+    
     def __init__(self):
         # Initialize API key manager for round-robin client usage
         self.api_manager = GeminiAPIKeyManager()
         self.model_name = 'models/gemini-2.5-flash'
-        print(f"🔧 Agent initialized with {self.api_manager.get_client_count()} API keys available")
+        # Opt-in so deterministic tests always hit the API
+        self.prompt_cache_enabled = os.getenv("GEMINI_PROMPT_CACHE") == "1"
+        logger.info("🔧 Agent initialized with %d API keys available", self.api_manager.get_client_count())
         
     @abstractmethod
     async def generate_content(
@@ -135,42 +153,86 @@ class BaseContentAgent(ABC):
     
     async def _call_gemini(self, prompt: str) -> str:
         """Make a call to Gemini with round-robin API key selection and error handling."""
-        import asyncio
-        start_time = time.time()
+        cache_key = hashlib.sha256(f"{self.model_name}\0{prompt}".encode()).hexdigest()
+        if self.prompt_cache_enabled:
+            cached = _PROMPT_CACHE.get(cache_key)
+            if cached and (time.monotonic_ns() - cached[0]) / 1e9 < PROMPT_CACHE_TTL_SECONDS:
+                _PROMPT_CACHE.move_to_end(cache_key)
+                logger.info("⚡ Gemini prompt cache hit (prompt length: %d chars)", len(prompt))
+                return cached[1]
+        
+        # Single-flight (always on): identical concurrent prompts share one upstream call
+        inflight = _INFLIGHT_PROMPTS.get(cache_key)
+        if inflight is not None:
+            logger.info("⚡ Joining in-flight Gemini call (prompt length: %d chars)", len(prompt))
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # The leader was cancelled (e.g. its own agent timeout), not us: issue our own call
+                if asyncio.current_task().cancelling():
+                    raise
+                return await self._call_gemini(prompt)
+        
+        future = asyncio.get_running_loop().create_future()
+        # Mark failures as retrieved even when no other caller joined
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        _INFLIGHT_PROMPTS[cache_key] = future
+        try:
+            text = await self._request_gemini(prompt)
+            if self.prompt_cache_enabled:
+                _PROMPT_CACHE[cache_key] = (time.monotonic_ns(), text)
+                _PROMPT_CACHE.move_to_end(cache_key)
+                while len(_PROMPT_CACHE) > PROMPT_CACHE_MAX_ENTRIES:
+                    _PROMPT_CACHE.popitem(last=False)
+            future.set_result(text)
+            return text
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            _INFLIGHT_PROMPTS.pop(cache_key, None)
+    
+    async def _request_gemini(self, prompt: str) -> str:
+        """Send a prompt to Gemini on the next round-robin client."""
+        start_ns = time.monotonic_ns()
         
         # Get next available client (round-robin)
         client = self.api_manager.get_next_client()
         
         try:
-            print(f"🤖 Making Gemini API call... (prompt length: {len(prompt)} chars)")
+            logger.info("🤖 Making Gemini API call... (prompt length: %d chars)", len(prompt))
             
-            # Run the synchronous Gemini call in a thread pool to make it truly async
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None, 
-                lambda: client.models.generate_content(
-                    model=self.model_name,
-                    contents=[prompt]
-                )
+            # Native async client: concurrent agents share the event loop, not executor threads
+            response = await client.aio.models.generate_content(
+                model=self.model_name,
+                contents=[prompt]
             )
             
-            api_time = time.time() - start_time
-            print(f"✅ Gemini API call completed in {api_time:.2f}s")
-            return response.text if hasattr(response, 'text') else str(response)
+            api_time = (time.monotonic_ns() - start_ns) / 1e9
+            logger.info("✅ Gemini API call completed in %.2fs", api_time)
+            return response.text
         except Exception as e:
-            api_time = time.time() - start_time
-            print(f"❌ Gemini API call FAILED after {api_time:.2f}s: {str(e)}")
+            api_time = (time.monotonic_ns() - start_ns) / 1e9
+            logger.error("❌ Gemini API call FAILED after %.2fs: %s", api_time, e)
             raise Exception(f"Gemini API call failed: {str(e)}")
     
+    def _parse_json_response(self, response: str) -> Dict[str, Any]:
+        """Strip code fences and decode a Gemini JSON reply (raises json.JSONDecodeError)."""
+        return orjson.loads(self._strip_code_fences(response))
+    
     def _strip_code_fences(self, text: str) -> str:
         """Remove code fences from Gemini responses."""
         if not isinstance(text, str):
             return text
         t = text.strip()
+        # C-level string scans and a single slice; replies can be tens of KB and this runs on the event loop
+        start, end = 0, len(t)
         if t.startswith('```'):
             first_newline = t.find('\n')
             if first_newline != -1:
-                t = t[first_newline+1:]
-        if t.endswith('```'):
-            t = t[:-3]
-        return t.strip()
+                start = first_newline + 1
+        if t.endswith('```') and end - 3 >= start:
+            end -= 3
+        return t[start:end].strip()
@@ -1,4 +1,3 @@
-import json
 from typing import Dict, Any
 from .base_agent import BaseContentAgent
 
@@ -53,10 +52,10 @@ class CodeEquationAgent(BaseContentAgent):
         
         try:
             response = await self._call_gemini(prompt)
-            result = json.loads(self._strip_code_fences(response))
+            result = self._parse_json_response(response)
             result["agent"] = "code_equation"
             return result
-        except:
+        except Exception:
             return {
                 "agent": "code_equation",
                 "equations": [{"formula": f, "explanation": f"Explanation for {f}", "variables": {}, "example_calculation": "Example calculation"} for f in formulas[:3]],
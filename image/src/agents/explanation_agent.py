@@ -76,8 +76,7 @@ class ExplanationAgent(BaseContentAgent):
         
         try:
             response = await self._call_gemini(prompt)
-            cleaned_response = self._strip_code_fences(response)
-            result = json.loads(cleaned_response)
+            result = self._parse_json_response(response)
             
             # Add metadata
             result["agent"] = "explanation"
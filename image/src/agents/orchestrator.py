@@ -1,8 +1,12 @@
 import asyncio
+import logging
+import threading
 import time
-from typing import Dict, Any, List, Optional
+from types import MappingProxyType
+from typing import Dict, Any, AsyncIterator, List, Mapping, Optional, Tuple
 from fastapi import HTTPException
 
+from .base_agent import BaseContentAgent, GeminiAPIKeyManager
 from .explanation_agent import ExplanationAgent
 # from .animation_config_agent import AnimationConfigAgent  # COMMENTED OUT - 138s bottleneck
 from .code_equation_agent import CodeEquationAgent
@@ -11,6 +15,62 @@ from .application_agent import ApplicationAgent
 from .summary_agent import SummaryAgent
 from .quiz_generation_agent import QuizGenerationAgent
 
+logger = logging.getLogger(__name__)
+
+# Agent instances are stateless, so one per type is shared by every orchestrator
+_AGENT_CACHE: Dict[str, BaseContentAgent] = {}
+_AGENT_CACHE_LOCK = threading.Lock()
+
+# Returned as-is for failed agents, so the payloads are never rebuilt
+_FALLBACK_CONTENT: Mapping[str, Dict[str, Any]] = MappingProxyType({
+    'explanation': {
+        "explanation": "This topic covers important concepts that build foundational understanding.",
+        "key_points": ["Core concept 1", "Core concept 2", "Core concept 3"]
+    },
+    # 'animation_config': {  # COMMENTED OUT - performance optimization
+    #     "config": "// Basic animation configuration\nconst config = { scene: 'basic', duration: 3000 };",
+    #     "description": "Simple animation setup"
+    # },
+    'code_equation': {
+        "code_examples": ["// Basic example\nconsole.log('Hello, learning!');"],
+        "equations": ["Basic formula: a + b = c"]
+    },
+    'visualization': {
+        "charts": ["basic_concept_diagram"],
+        "description": "Conceptual visualization"
+    },
+    'application': {
+        "examples": ["Real-world application examples to be added"],
+        "connections": "Practical applications in everyday life"
+    },
+    'summary': {
+        "key_points": ["Main concept", "Important detail", "Key takeaway"],
+        "summary": "Summary of key learning objectives"
+    },
+    'quiz_generation': {
+        "questions": [
+            {
+                "question": "What is the main topic covered?",
+                "options": ["Option A", "Option B", "Option C", "Option D"],
+                "correct": 0,
+                "explanation": "Basic comprehension question"
+            }
+        ]
+    }
+})
+_DEFAULT_FALLBACK: Dict[str, Any] = {"content": "Fallback content generated"}
+
+# Learning format -> agent that produces it (video generation & animation removed for performance)
+_FORMAT_MAPPING: Mapping[str, str] = MappingProxyType({
+    'concept_explanation': 'explanation', 
+    # 'static_animation': 'animation_config',  # COMMENTED OUT - performance optimization
+    'code_equations': 'code_equation',
+    'visual_diagrams': 'visualization',
+    'practice_problems': 'quiz_generation',
+    'real_world_applications': 'application',
+    'summary_cards': 'summary'
+})
+
 
 class ContentOrchestrator:
     """
@@ -21,17 +81,22 @@ class ContentOrchestrator:
     """
     
     def __init__(self):
-        # Initialize all specialized agents (video generation & animation removed for performance)
+        # Register specialized agent classes; each is only built on first use (video generation & animation removed for performance)
         self.agents = {
-            'explanation': ExplanationAgent(),
-            # 'animation_config': AnimationConfigAgent(),  # COMMENTED OUT - 138s bottleneck
-            'code_equation': CodeEquationAgent(),
-            'visualization': VisualizationAgent(),
-            'application': ApplicationAgent(),
-            'summary': SummaryAgent(),
-            'quiz_generation': QuizGenerationAgent()
+            'explanation': ExplanationAgent,
+            # 'animation_config': AnimationConfigAgent,  # COMMENTED OUT - 138s bottleneck
+            'code_equation': CodeEquationAgent,
+            'visualization': VisualizationAgent,
+            'application': ApplicationAgent,
+            'summary': SummaryAgent,
+            'quiz_generation': QuizGenerationAgent
         }
         
+        # Key count is fixed once the key manager has loaded the environment
+        self.api_key_count = GeminiAPIKeyManager().get_client_count()
+        # Reduce stagger delay if we have multiple API keys
+        self.stagger_delay = 0.2 if self.api_key_count > 1 else 1.0
+        
     async def run_single_agent(
         self,
         agent_type: str,
@@ -57,14 +122,14 @@ class ContentOrchestrator:
                 detail=f"Unknown agent type: {agent_type}. Available: {list(self.agents.keys())}"
             )
         
-        print(f"🔧 Running single agent: {agent_type}")
-        start_time = time.time()
+        logger.info("🔧 Running single agent: %s", agent_type)
+        start_time = time.monotonic()
         
         try:
             result = await self._execute_agent_safely(
                 agent_type, work_order, gemini_analysis, user_context
             )
-            execution_time = time.time() - start_time
+            execution_time = time.monotonic() - start_time
             
             return {
                 "agent_type": agent_type,
@@ -73,7 +138,7 @@ class ContentOrchestrator:
                 "content": result
             }
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.monotonic() - start_time
             return {
                 "agent_type": agent_type,
                 "status": "failed",
@@ -98,101 +163,29 @@ class ContentOrchestrator:
         Returns:
             Dictionary with generated content from all agents
         """
-        start_time = time.time()
-        print(f"🎯 Starting content orchestration with {len(self.agents)} specialized agents...")
-        print(f"⏰ Orchestration started at: {time.strftime('%H:%M:%S')}")
-        
-        # Prepare tasks for parallel execution
-        tasks = []
-        agent_names = []
-        agent_start_times = {}
-        
-        for agent_type, order in work_orders.items():
-            if agent_type in self.agents:
-                print(f"📋 Queuing {agent_type} agent with work order: {str(order)[:100]}...")
-                task = self._execute_agent_safely(
-                    agent_type, 
-                    order, 
-                    gemini_analysis, 
-                    user_context
-                )
-                tasks.append(task)
-                agent_names.append(agent_type)
-                agent_start_times[agent_type] = time.time()
-            else:
-                print(f"⚠️  Unknown agent type: {agent_type}")
-        
-        # Execute agents with staggered start to reduce API rate limiting
-        print(f"🚀 Executing {len(tasks)} agents with staggered start...")
-        print(f"🔧 Agent types being executed: {', '.join(agent_names)}")
-        
-        # Intelligent staggering based on available API keys
-        from .base_agent import GeminiAPIKeyManager
-        api_manager = GeminiAPIKeyManager()
-        api_key_count = api_manager.get_client_count()
-        
-        # Reduce stagger delay if we have multiple API keys
-        stagger_delay = 0.2 if api_key_count > 1 else 1.0
-        print(f"🔑 Using {api_key_count} API keys with {stagger_delay}s stagger delay")
-        
-        staggered_tasks = []
-        for i, task in enumerate(tasks):
-            if i > 0:  # Don't delay the first agent
-                staggered_task = self._delayed_execution(task, i * stagger_delay)
-                staggered_tasks.append(staggered_task)
-            else:
-                staggered_tasks.append(task)
-        
-        # Add timeout and better error handling
-        try:
-            results = await asyncio.wait_for(
-                asyncio.gather(*staggered_tasks, return_exceptions=True),
-                timeout=300  # 5 minute timeout
-            )
-        except asyncio.TimeoutError:
-            print("⏱️ TIMEOUT: Some agents took longer than 5 minutes!")
-            results = [Exception("Timeout after 5 minutes") for _ in staggered_tasks]
+        start_time = time.monotonic()
+        logger.info("🎯 Starting content orchestration with %d specialized agents...", len(self.agents))
         
-        # Process results and handle any failures
         content_results = {}
-        successful_agents = 0
-        failed_agents = []
+        async for update in self.stream_content_generation(work_orders, gemini_analysis, user_context):
+            content_results[update["agent"]] = update["result"]
         
-        for i, result in enumerate(results):
-            agent_name = agent_names[i]
-            execution_time = time.time() - agent_start_times[agent_name]
-            
-            if isinstance(result, Exception):
-                print(f"❌ Agent {agent_name} FAILED after {execution_time:.2f}s: {str(result)}")
-                failed_agents.append(agent_name)
-                content_results[agent_name] = {
-                    "status": "failed",
-                    "error": str(result),
-                    "execution_time": execution_time,
-                    "fallback_content": self._generate_fallback_content(agent_name)
-                }
-            else:
-                print(f"✅ Agent {agent_name} SUCCESS in {execution_time:.2f}s")
-                successful_agents += 1
-                content_results[agent_name] = {
-                    "status": "success",
-                    "execution_time": execution_time,
-                    "content": result
-                }
+        successful_agents = sum(1 for result in content_results.values() if result["status"] == "success")
+        failed_agents = [name for name, result in content_results.items() if result["status"] != "success"]
         
-        total_time = time.time() - start_time
+        total_time = time.monotonic() - start_time
         orchestration_summary = {
-            "total_agents": len(tasks),
+            "total_agents": len(content_results),
             "successful_agents": successful_agents,
             "failed_agents": len(failed_agents),
             "failed_agent_names": failed_agents,
             "execution_mode": "parallel",
             "total_execution_time": total_time,
-            "average_agent_time": total_time / len(tasks) if tasks else 0
+            "average_agent_time": total_time / len(content_results) if content_results else 0
         }
         
-        print(f"🎉 Content orchestration complete! {successful_agents}/{len(tasks)} agents successful")
-        print(f"⏱️ Total orchestration time: {total_time:.2f} seconds")
+        logger.info("🎉 Content orchestration complete! %d/%d agents successful", successful_agents, len(content_results))
+        logger.info("⏱️ Total orchestration time: %.2f seconds", total_time)
         
         return {
             "orchestration_summary": orchestration_summary,
@@ -200,6 +193,83 @@ class ContentOrchestrator:
             "learning_formats": self._structure_learning_formats(content_results)
         }
     
+    async def stream_content_generation(
+        self,
+        work_orders: Dict[str, Any],
+        gemini_analysis: Dict[str, Any],
+        user_context: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run agents in parallel and yield each result as soon as its agent finishes.
+        
+        Yields:
+            {"agent": agent_type, "result": {...}} in completion order, so fast
+            formats can be rendered while slower agents are still running
+        """
+        tasks = {}
+        agent_start_times = {}
+        
+        # Intelligent staggering based on available API keys
+        stagger_delay = self.stagger_delay
+        logger.info("🔑 Using %d API keys with %ss stagger delay", self.api_key_count, stagger_delay)
+        
+        for agent_type, order in work_orders.items():
+            if agent_type not in self.agents:
+                logger.warning("⚠️  Unknown agent type: %s", agent_type)
+                continue
+            
+            logger.debug("📋 Queuing %s agent with work order: %.100s...", agent_type, order)
+            coro = self._execute_agent_safely(agent_type, order, gemini_analysis, user_context)
+            if tasks:  # Don't delay the first agent
+                coro = self._delayed_execution(coro, len(tasks) * stagger_delay)
+            tasks[agent_type] = asyncio.create_task(self._run_named(agent_type, coro), name=agent_type)
+            agent_start_times[agent_type] = time.monotonic()
+        
+        if not tasks:
+            logger.warning("⚠️  No runnable work orders (requested: %s)", ", ".join(work_orders) or "none")
+            return
+        
+        logger.info("🚀 Executing %d agents with staggered start...", len(tasks))
+        logger.info("🔧 Agent types being executed: %s", ", ".join(tasks))
+        
+        # Each agent is bounded by its own max_duration, so no orchestration-wide timeout is needed
+        try:
+            for next_done in asyncio.as_completed(tasks.values()):
+                agent_name, result = await next_done
+                yield {
+                    "agent": agent_name,
+                    "result": self._build_agent_result(agent_name, result, time.monotonic() - agent_start_times[agent_name])
+                }
+        finally:
+            # Stop stragglers if the consumer stops iterating early
+            for task in tasks.values():
+                task.cancel()
+    
+    async def _run_named(self, agent_type: str, coro) -> Tuple[str, Any]:
+        """Await an agent coroutine, pairing its result (or exception) with the agent name."""
+        try:
+            return agent_type, await coro
+        except Exception as e:
+            return agent_type, e
+    
+    def _build_agent_result(self, agent_name: str, result: Any, execution_time: float) -> Dict[str, Any]:
+        """Wrap a raw agent result or exception in the per-agent response shape."""
+        if isinstance(result, Exception):
+            logger.error("❌ Agent %s FAILED after %.2fs: %s", agent_name, execution_time, result)
+            return {
+                "status": "failed",
+                "error": str(result),
+                "execution_time": execution_time,
+                "fallback_content": self._generate_fallback_content(agent_name)
+            }
+        
+        logger.info("✅ Agent %s SUCCESS in %.2fs", agent_name, execution_time)
+        return {
+            "status": "success",
+            "execution_time": execution_time,
+            "content": result
+        }
+    
     async def _execute_agent_safely(
         self, 
         agent_type: str, 
@@ -208,23 +278,40 @@ class ContentOrchestrator:
         user_context: Dict[str, Any]
     ) -> Any:
         """Execute a single agent with error handling."""
-        agent_start = time.time()
+        agent_logger = logger.getChild(agent_type)
+        agent_start = time.perf_counter()
         try:
-            print(f"🔄 {agent_type} agent STARTING...")
-            agent = self.agents[agent_type]
-            print(f"🔧 {agent_type} agent initialized, calling generate_content...")
+            agent_logger.info("🔄 %s agent STARTING...", agent_type)
+            agent = self._get_agent(agent_type)
+            agent_logger.debug("🔧 %s agent initialized, calling generate_content...", agent_type)
             
-            result = await agent.generate_content(work_order, gemini_analysis, user_context)
+            try:
+                result = await asyncio.wait_for(
+                    agent.generate_content(work_order, gemini_analysis, user_context),
+                    timeout=agent.max_duration
+                )
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"{agent_type} agent timed out after {agent.max_duration}s")
             
-            agent_time = time.time() - agent_start
-            print(f"✅ {agent_type} agent COMPLETED in {agent_time:.2f}s")
+            agent_time = time.perf_counter() - agent_start
+            agent_logger.info("✅ %s agent COMPLETED in %.2fs", agent_type, agent_time)
             return result
         except Exception as e:
-            agent_time = time.time() - agent_start
-            print(f"🚨 ERROR in {agent_type} agent after {agent_time:.2f}s: {str(e)}")
-            print(f"🔍 {agent_type} work_order keys: {list(work_order.keys()) if work_order else 'None'}")
+            agent_time = time.perf_counter() - agent_start
+            agent_logger.error("🚨 ERROR in %s agent after %.2fs: %s", agent_type, agent_time, e)
+            agent_logger.error("🔍 %s work_order keys: %s", agent_type, list(work_order.keys()) if work_order else None)
             raise e
     
+    def _get_agent(self, agent_type: str) -> BaseContentAgent:
+        """Return the shared agent instance for agent_type, creating it on first use."""
+        agent = _AGENT_CACHE.get(agent_type)
+        if agent is None:
+            with _AGENT_CACHE_LOCK:
+                agent = _AGENT_CACHE.get(agent_type)
+                if agent is None:
+                    agent = _AGENT_CACHE[agent_type] = self.agents[agent_type]()
+        return agent
+    
     async def _delayed_execution(self, task, delay_seconds: float):
         """Execute a task after a delay to stagger API calls."""
         await asyncio.sleep(delay_seconds)
@@ -232,70 +319,17 @@ class ContentOrchestrator:
     
     def _generate_fallback_content(self, agent_name: str) -> Dict[str, Any]:
         """Generate fallback content when an agent fails."""
-        fallbacks = {
-            'explanation': {
-                "explanation": "This topic covers important concepts that build foundational understanding.",
-                "key_points": ["Core concept 1", "Core concept 2", "Core concept 3"]
-            },
-            # 'animation_config': {  # COMMENTED OUT - performance optimization
-            #     "config": "// Basic animation configuration\nconst config = { scene: 'basic', duration: 3000 };",
-            #     "description": "Simple animation setup"
-            # },
-            'code_equation': {
-                "code_examples": ["// Basic example\nconsole.log('Hello, learning!');"],
-                "equations": ["Basic formula: a + b = c"]
-            },
-            'visualization': {
-                "charts": ["basic_concept_diagram"],
-                "description": "Conceptual visualization"
-            },
-            'application': {
-                "examples": ["Real-world application examples to be added"],
-                "connections": "Practical applications in everyday life"
-            },
-            'summary': {
-                "key_points": ["Main concept", "Important detail", "Key takeaway"],
-                "summary": "Summary of key learning objectives"
-            },
-            'quiz_generation': {
-                "questions": [
-                    {
-                        "question": "What is the main topic covered?",
-                        "options": ["Option A", "Option B", "Option C", "Option D"],
-                        "correct": 0,
-                        "explanation": "Basic comprehension question"
-                    }
-                ]
-            }
-        }
-        
-        return fallbacks.get(agent_name, {"content": "Fallback content generated"})
+        return _FALLBACK_CONTENT.get(agent_name, _DEFAULT_FALLBACK)
     
     def _structure_learning_formats(self, content_results: Dict[str, Any]) -> Dict[str, Any]:
         """Structure the results into the 8 learning formats for the frontend."""
-        formats = {}
-        
-        # Map agent results to learning formats (video generation & animation removed for performance)
-        format_mapping = {
-            'concept_explanation': 'explanation', 
-            # 'static_animation': 'animation_config',  # COMMENTED OUT - performance optimization
-            'code_equations': 'code_equation',
-            'visual_diagrams': 'visualization',
-            'practice_problems': 'quiz_generation',
-            'real_world_applications': 'application',
-            'summary_cards': 'summary'
+        return {
+            format_name: content_results.get(agent_name) or {
+                "status": "not_generated",
+                "content": _FALLBACK_CONTENT.get(agent_name, _DEFAULT_FALLBACK)
+            }
+            for format_name, agent_name in _FORMAT_MAPPING.items()
         }
-        
-        for format_name, agent_name in format_mapping.items():
-            if agent_name in content_results:
-                formats[format_name] = content_results[agent_name]
-            else:
-                formats[format_name] = {
-                    "status": "not_generated",
-                    "content": self._generate_fallback_content(agent_name)
-                }
-        
-        return formats
     
     def get_orchestrator_info(self) -> Dict[str, Any]:
         """Get information about the orchestrator and available agents."""
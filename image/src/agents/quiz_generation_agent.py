@@ -1,4 +1,3 @@
-import json
 from typing import Dict, Any
 from .base_agent import BaseContentAgent
 
@@ -66,10 +65,10 @@ class QuizGenerationAgent(BaseContentAgent):
         
         try:
             response = await self._call_gemini(prompt)
-            result = json.loads(self._strip_code_fences(response))
+            result = self._parse_json_response(response)
             result["agent"] = "quiz_generation"
             return result
-        except:
+        except Exception:
             return {
                 "agent": "quiz_generation",
                 "quiz_metadata": {
@@ -1,7 +1,68 @@
 import os
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from fastapi import HTTPException
 import google.genai as genai
+import orjson
+
+
+# (keywords, charts, code examples) per subject, checked in order against "subject topic"
+_SUBJECT_WORK_ORDER_PROFILES = (
+    (
+        ("chem", "stoich", "titration", "acid", "base", "mole", "reaction"),
+        ("reaction_progress_curve", "mole_ratio_bar", "titration_curve"),
+        (
+            "Compute molar mass from formula",
+            "Convert grams <-> moles",
+            "Calculate molarity (M = moles / liters)",
+            "Estimate pH from [H+]"
+        )
+    ),
+    (
+        ("bio", "genetic", "cell", "ecosystem", "enzyme"),
+        ("pathway_flowchart", "population_growth_curve", "enzyme_activity_plot"),
+        (
+            "Simulate logistic population growth",
+            "Translate DNA -> RNA -> Protein mapping",
+            "Compute reaction rate from concentration vs time"
+        )
+    ),
+    (
+        ("phys", "mechanics", "kinematics", "projectile"),
+        ("trajectory_parabola", "vx_constant_plot", "vy_vs_time"),
+        (
+            "Compute range given v and angle",
+            "Compute altitude using dy = 1/2 a t^2"
+        )
+    ),
+    (
+        ("math", "calculus", "algebra", "geometry", "probability"),
+        ("function_plot", "slope_field", "histogram"),
+        (
+            "Plot y = f(x) and highlight extrema",
+            "Approximate derivative numerically",
+            "Monte Carlo estimate of probability"
+        )
+    ),
+    (
+        ("cs", "computer", "algorithm", "data structure"),
+        ("complexity_chart", "flowchart", "state_diagram"),
+        (
+            "Time complexity comparator",
+            "Implement BFS and show traversal order",
+            "Visualize sorting swaps"
+        )
+    ),
+)
+
+
+@lru_cache(maxsize=64)
+def _match_subject_profile(subject_l: str) -> Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+    """Return (charts, code examples) for the first profile whose keywords appear in subject_l."""
+    for keywords, profile_charts, profile_examples in _SUBJECT_WORK_ORDER_PROFILES:
+        if any(k in subject_l for k in keywords):
+            return profile_charts, profile_examples
+    return None
 
 
 class GeminiSpeechToTextAgent:
@@ -51,42 +112,11 @@ class GeminiSpeechToTextAgent:
 
         subject_l = f"{subject} {topic}".lower()
 
-        # Subject-aware visualization suggestions
-        if any(k in subject_l for k in ["chem", "stoich", "titration", "acid", "base", "mole", "reaction"]):
-            charts = ["reaction_progress_curve", "mole_ratio_bar", "titration_curve"]
-            code_examples = [
-                "Compute molar mass from formula",
-                "Convert grams <-> moles",
-                "Calculate molarity (M = moles / liters)",
-                "Estimate pH from [H+]"
-            ]
-        elif any(k in subject_l for k in ["bio", "genetic", "cell", "ecosystem", "enzyme"]):
-            charts = ["pathway_flowchart", "population_growth_curve", "enzyme_activity_plot"]
-            code_examples = [
-                "Simulate logistic population growth",
-                "Translate DNA -> RNA -> Protein mapping",
-                "Compute reaction rate from concentration vs time"
-            ]
-        elif any(k in subject_l for k in ["phys", "mechanics", "kinematics", "projectile"]):
-            charts = ["trajectory_parabola", "vx_constant_plot", "vy_vs_time"]
-            code_examples = [
-                "Compute range given v and angle",
-                "Compute altitude using dy = 1/2 a t^2"
-            ]
-        elif any(k in subject_l for k in ["math", "calculus", "algebra", "geometry", "probability"]):
-            charts = ["function_plot", "slope_field", "histogram"]
-            code_examples = [
-                "Plot y = f(x) and highlight extrema",
-                "Approximate derivative numerically",
-                "Monte Carlo estimate of probability"
-            ]
-        elif any(k in subject_l for k in ["cs", "computer", "algorithm", "data structure"]):
-            charts = ["complexity_chart", "flowchart", "state_diagram"]
-            code_examples = [
-                "Time complexity comparator",
-                "Implement BFS and show traversal order",
-                "Visualize sorting swaps"
-            ]
+        # Subject-aware visualization suggestions (first matching profile wins)
+        profile = _match_subject_profile(subject_l)
+        if profile:
+            charts = list(profile[0])
+            code_examples = list(profile[1])
         else:
             # General default
             charts = ["concept_map", "timeline"]
@@ -328,12 +358,11 @@ class GeminiSpeechToTextAgent:
             
             # Parse Gemini's response
             try:
-                import json
                 # The response might have a different structure in google-genai
                 response_text = response.text if hasattr(response, 'text') else str(response)
                 cleaned = self._strip_code_fences(response_text)
-                analysis_data = json.loads(cleaned)
-            except json.JSONDecodeError:
+                analysis_data = orjson.loads(cleaned)
+            except orjson.JSONDecodeError:
                 # If Gemini doesn't return valid JSON, structure the response
                 analysis_data = {
                     "transcription": response_text.strip(),
@@ -378,8 +407,7 @@ CRITICAL: DO NOT include video_generation or animation_config agents - they are
                         contents=[work_orders_prompt, str(analysis_data)]
                     )
                     wo_text = work_orders_resp.text if hasattr(work_orders_resp, 'text') else str(work_orders_resp)
-                    import json as _json
-                    work_orders = _json.loads(self._strip_code_fences(wo_text))
+                    work_orders = orjson.loads(self._strip_code_fences(wo_text))
                 except Exception:
                     work_orders = self._build_work_orders(analysis_data)
             else:
@@ -399,7 +427,7 @@ CRITICAL: DO NOT include video_generation or animation_config agents - they are
             try:
                 if 'uploaded_file' in locals():
                     self.client.files.delete(name=uploaded_file.name)
-            except:
+            except Exception:
                 pass
                 
             raise HTTPException(
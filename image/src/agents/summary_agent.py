@@ -1,4 +1,3 @@
-import json
 from typing import Dict, Any
 from .base_agent import BaseContentAgent
 
@@ -52,10 +51,10 @@ class SummaryAgent(BaseContentAgent):
         
         try:
             response = await self._call_gemini(prompt)
-            result = json.loads(self._strip_code_fences(response))
+            result = self._parse_json_response(response)
             result["agent"] = "summary"
             return result
-        except:
+        except Exception:
             return {
                 "agent": "summary",
                 "executive_summary": f"This topic covers {', '.join(key_points[:3])}, providing fundamental understanding for {user_context.get('major', 'students')}.",
@@ -1,33 +1,32 @@
-import json
+import logging
 from typing import Dict, Any, List
 from .base_agent import BaseContentAgent
 from models.chart_schemas import StandardizedChartConfig
 
+logger = logging.getLogger(__name__)
 
-class VisualizationAgent(BaseContentAgent):
-    """Generates visual diagrams and charts using standardized schema."""
+# Both are constant, so build them once instead of per call
+_CHART_TEMPLATE = StandardizedChartConfig.get_json_template_for_ai()
+_FALLBACK_CHART = StandardizedChartConfig.get_fallback_chart()
 
-    async def generate_content(self, work_order: Dict[str, Any], gemini_analysis: Dict[str, Any], user_context: Dict[str, Any]) -> Dict[str, Any]:
-        user_bg = self._get_user_background_context(user_context)
-        subject_context = self._get_subject_context(gemini_analysis)
-        
-        charts = work_order.get("charts", [])
-        num_charts = len(charts) if charts else 3
-        
-        # Get the standardized template for AI to follow
-        chart_template = StandardizedChartConfig.get_json_template_for_ai()
-        
-        # Get language instruction
-        language_instruction = self._get_language_instruction(user_context)
-        
-        prompt = f"""
+_FALLBACK_DIAGRAM = {
+    "type": "concept_diagram", 
+    "title": "Educational Concept Overview",
+    "description": "Visual overview of key concepts",
+    "elements": ["concept1", "concept2", "concept3"], 
+    "connections": ["relates to", "builds upon", "leads to"],
+    "svg_code": "<svg width='400' height='300' viewBox='0 0 400 300'><rect x='10' y='10' width='380' height='280' fill='#f8f9fa' stroke='#dee2e6'/><text x='200' y='150' text-anchor='middle' font-size='16'>Educational Diagram</text></svg>"
+}
+_FALLBACK_METAPHORS = "Visual representations help understand concepts through standardized charts and diagrams"
+
+_PROMPT_TEMPLATE = """
         Generate visual diagrams and chart specifications for educational content.
         
         {user_bg}
         {subject_context}
         {language_instruction}
         
-        Charts needed: {', '.join(charts) if charts else 'Generate appropriate charts for the content'}
+        Charts needed: {charts}
         
         You must generate exactly {num_charts} charts following this EXACT structure for each chart:
         {chart_template}
@@ -66,30 +65,45 @@ class VisualizationAgent(BaseContentAgent):
         
         Output pure JSON only.
         """
+
+
+class VisualizationAgent(BaseContentAgent):
+    """Generates visual diagrams and charts using standardized schema."""
+
+    async def generate_content(self, work_order: Dict[str, Any], gemini_analysis: Dict[str, Any], user_context: Dict[str, Any]) -> Dict[str, Any]:
+        user_bg = self._get_user_background_context(user_context)
+        subject_context = self._get_subject_context(gemini_analysis)
+        
+        charts = work_order.get("charts", [])
+        num_charts = len(charts) if charts else 3
+        
+        # Get language instruction
+        language_instruction = self._get_language_instruction(user_context)
+        
+        prompt = _PROMPT_TEMPLATE.format_map({
+            "user_bg": user_bg,
+            "subject_context": subject_context,
+            "language_instruction": language_instruction,
+            "charts": ', '.join(charts) if charts else 'Generate appropriate charts for the content',
+            "num_charts": num_charts,
+            "chart_template": _CHART_TEMPLATE
+        })
         
         try:
             response = await self._call_gemini(prompt)
-            result = json.loads(self._strip_code_fences(response))
+            result = self._parse_json_response(response)
             result["agent"] = "visualization"
             result["schema_version"] = "1.0"
             return result
             
-        except Exception as e:
-            # Simple fallback without validation crashes
-            fallback_chart = StandardizedChartConfig.get_fallback_chart()
-            
+        except Exception:
+            # Simple fallback without validation crashes (cancellation still propagates)
+            logger.warning("📊 Visualization agent falling back to template content", exc_info=True)
             return {
                 "agent": "visualization",
-                "diagrams": [{
-                    "type": "concept_diagram", 
-                    "title": "Educational Concept Overview",
-                    "description": "Visual overview of key concepts",
-                    "elements": ["concept1", "concept2", "concept3"], 
-                    "connections": ["relates to", "builds upon", "leads to"],
-                    "svg_code": "<svg width='400' height='300' viewBox='0 0 400 300'><rect x='10' y='10' width='380' height='280' fill='#f8f9fa' stroke='#dee2e6'/><text x='200' y='150' text-anchor='middle' font-size='16'>Educational Diagram</text></svg>"
-                }],
-                "chart_configs": [fallback_chart],
-                "visual_metaphors": "Visual representations help understand concepts through standardized charts and diagrams",
+                "diagrams": [_FALLBACK_DIAGRAM],
+                "chart_configs": [_FALLBACK_CHART],
+                "visual_metaphors": _FALLBACK_METAPHORS,
                 "status": "fallback_generated",
                 "schema_version": "1.0"
             }
@@ -1,31 +1,85 @@
 from fastapi import FastAPI, Depends, HTTPException, Header, UploadFile, File, Form, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import APIKeyHeader, HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import JSONResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from mangum import Mangum
+import asyncio
+import atexit
+import contextlib
+import hashlib
+import hmac
+import logging
+import logging.handlers
 import os
+import queue
+import secrets
 import tempfile
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Dict, Optional
 from dotenv import load_dotenv
+import orjson
 
 from utils.video_processor import VideoProcessor
-from utils.auth import AuthManager, get_current_user_id
+from utils.auth import AuthManager, decode_user_id
 from utils.dynamodb_client import DynamoDBClient
+from utils.middleware import ApiKeyASGIMiddleware, UploadGuardMiddleware
 from agents.speech_to_text_agent import GeminiSpeechToTextAgent
 from agents.orchestrator import ContentOrchestrator
 from models.schemas import (
     UserSignupRequest, UserSigninRequest, UserPreferencesUpdate, 
-    UserResponse, AuthResponse, VideoProcessingRequest
+    UserResponse, AuthResponse, VideoProcessingRequest, AgentBatchTestRequest
 )
 
 # Load .env file from project root
 load_dotenv(dotenv_path="../../.env")
 
+# Route logging through a queue so handler I/O happens on a background thread,
+# not on the event loop serving concurrent agents
+_log_queue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler)
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), handlers=[_log_queue_handler])
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logger = logging.getLogger(__name__)
+
 # Simple API key from environment
 API_KEY = os.getenv("API_KEY", "vth_hackathon_2025_secret_key")
 
+class ORJSONResponse(JSONResponse):
+    """Render JSON with orjson; the large nested analysis payloads serialize several times faster."""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+# Opt-in outside local runs: deployed tables come from infrastructure, not a CreateTable call per cold start
+CREATE_TABLE_ON_STARTUP = os.getenv(
+    "CREATE_TABLE_ON_STARTUP", "0" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "1"
+) == "1"
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One persistent, named pool for blocking SDK/ffmpeg work offloaded by the agents
+    executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="agent-io")
+    asyncio.get_running_loop().set_default_executor(executor)
+    # Create DynamoDB table if it doesn't exist (local development only; Lambda tables are provisioned)
+    if CREATE_TABLE_ON_STARTUP:
+        try:
+            await asyncio.to_thread(db_client.create_table_if_not_exist)
+        except Exception as e:
+            logger.warning("Note: Could not create DynamoDB table: %s", e)
+    yield
+    executor.shutdown(wait=False)
+
 app = FastAPI(
     title="VTHacks 2025 Backend - EduTransform AI", 
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     description="Educational video processing backend with AI-powered content extraction and user management",
     tags_metadata=[
         {
@@ -59,24 +113,42 @@ db_client = DynamoDBClient()
 # Initialize Gemini agent (for Best Use of Gemini API prize!)
 try:
     gemini_agent = GeminiSpeechToTextAgent()
-    print("🏆 Google Gemini 1.5 Pro initialized for Best Use of Gemini API!")
+    logger.info("🏆 Google Gemini 1.5 Pro initialized for Best Use of Gemini API!")
 except ValueError as e:
-    print(f"⚠️ Gemini agent initialization failed: {e}")
+    logger.warning("⚠️ Gemini agent initialization failed: %s", e)
     gemini_agent = None
 
 # Initialize Content Orchestrator
 try:
     content_orchestrator = ContentOrchestrator()
-    print("🎯 Content Orchestrator initialized with 6 specialized agents!")
+    logger.info("🎯 Content Orchestrator initialized with 6 specialized agents!")
 except Exception as e:
-    print(f"⚠️ Content Orchestrator initialization failed: {e}")
+    logger.warning("⚠️ Content Orchestrator initialization failed: %s", e)
     content_orchestrator = None
 
-# Create DynamoDB table if it doesn't exist (for local development)
-try:
-    db_client.create_table_if_not_exist()
-except Exception as e:
-    print(f"Note: Could not create DynamoDB table (normal for AWS deployment): {e}")
+# Upload limits (100MB for hackathon)
+MAX_VIDEO_UPLOAD_BYTES = 100 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Reject oversized or non-multipart uploads from headers alone, before the body is read
+UPLOAD_PATH_PREFIXES = ("/api/extract-audio", "/api/process-video")
+app.add_middleware(
+    UploadGuardMiddleware,
+    max_bytes=MAX_VIDEO_UPLOAD_BYTES,
+    upload_prefixes=UPLOAD_PATH_PREFIXES
+)
+
+# API key check for /api/* (signup/signin are open; user routes need the key plus a Bearer token).
+# Added after the upload guard so it runs first (unauthenticated clients get 401, not 413/415),
+# and before CORS so CORS stays outermost and also decorates the 401s.
+API_KEY_PROTECTED_PREFIXES = ("/api/",)
+API_KEY_EXEMPT_PREFIXES = ("/api/auth/",)
+app.add_middleware(
+    ApiKeyASGIMiddleware,
+    api_key=API_KEY,
+    protected_prefixes=API_KEY_PROTECTED_PREFIXES,
+    exempt_prefixes=API_KEY_EXEMPT_PREFIXES
+)
 
 # Add CORS middleware to allow all origins
 app.add_middleware(
@@ -88,17 +160,35 @@ app.add_middleware(
 )
 
 # Security schemes
-api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 bearer_scheme = HTTPBearer()
 
-def validate_api_key(x_api_key: str = Depends(api_key_header)):
-    if not x_api_key or x_api_key != API_KEY:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-    return x_api_key
+_default_openapi = app.openapi
 
-def get_current_user_from_token(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)) -> str:
+def openapi_with_api_key() -> Dict[str, Any]:
+    """Document the middleware-enforced X-API-Key so /docs can still authorize requests."""
+    if app.openapi_schema:
+        return app.openapi_schema
+    schema = _default_openapi()
+    schema.setdefault("components", {}).setdefault("securitySchemes", {})["APIKeyHeader"] = {
+        "type": "apiKey", "in": "header", "name": "X-API-Key"
+    }
+    for path, operations in schema["paths"].items():
+        if path.startswith(API_KEY_PROTECTED_PREFIXES) and not path.startswith(API_KEY_EXEMPT_PREFIXES):
+            for operation in operations.values():
+                # Separate requirement objects are alternatives; the server needs the key on top of each one
+                security = operation.setdefault("security", [])
+                for requirement in security:
+                    requirement["APIKeyHeader"] = []
+                if not security:
+                    security.append({"APIKeyHeader": []})
+    app.openapi_schema = schema
+    return schema
+
+app.openapi = openapi_with_api_key
+
+async def get_current_user_from_token(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)) -> str:
     """Get current user ID from Bearer token."""
-    user_id = get_current_user_id(f"Bearer {credentials.credentials}")
+    user_id = decode_user_id(credentials.credentials)
     if not user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -106,15 +196,50 @@ def get_current_user_from_token(credentials: HTTPAuthorizationCredentials = Depe
         )
     return user_id
 
+def _copy_upload_to_temp(src: BinaryIO) -> str:
+    """Copy an upload's spooled file to a temp .mp4 in fixed-size chunks, stopping once it passes the size cap."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as temp_video:
+        try:
+            src.seek(0)
+            copied = 0
+            while chunk := src.read(UPLOAD_CHUNK_SIZE):
+                copied += len(chunk)
+                # Backstop for clients that didn't report a size up front
+                if copied > MAX_VIDEO_UPLOAD_BYTES:
+                    raise HTTPException(status_code=400, detail="Video file too large (max 100MB)")
+                temp_video.write(chunk)
+        except BaseException:
+            temp_video.close()
+            os.unlink(temp_video.name)
+            raise
+    return temp_video.name
+
+async def save_upload_to_temp(video: UploadFile) -> str:
+    """Copy an upload to a temp .mp4 on a worker thread (one hop for the whole file, not per chunk)."""
+    return await asyncio.to_thread(_copy_upload_to_temp, video.file)
+
+# Mock context shared by the debug agent endpoints
+DEBUG_GEMINI_ANALYSIS = {
+    "educational_analysis": {
+        "subject": "Chemistry",
+        "topic": "Chemical Bonds"
+    }
+}
+DEBUG_USER_CONTEXT = {
+    "major": "Computer Science",
+    "academicLevel": "College"
+}
+DEBUG_AGENT_TIMEOUT_SECONDS = 60
+
 # ============= HEALTH & STATUS ENDPOINTS =============
 
 @app.get("/", tags=["Health & Status"])
-def root():
+async def root():
     """Welcome message and API information."""
     return {"message": "Welcome to VTHacks 2025 Backend API"}
 
 @app.get("/health", tags=["Health & Status"])
-def health():
+async def health():
     """Health check endpoint for monitoring."""
     return {"status": "healthy"}
 
@@ -125,21 +250,13 @@ def health():
 # ============= AUTHENTICATION ENDPOINTS =============
 
 @app.post("/api/auth/signup", response_model=AuthResponse, tags=["Authentication"])
-def signup_user(user_data: UserSignupRequest):
+async def signup_user(user_data: UserSignupRequest):
     """
     User signup with preferences. Creates account and returns auth token.
     No API key required for signup.
     """
-    # Check if username already exists
-    existing_user = db_client.get_user_by_username(user_data.username)
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already registered"
-        )
-    
-    # Hash password
-    password_hash = auth_manager.hash_password(user_data.password)
+    # Hash password (CPU-heavy, so keep it off the event loop)
+    password_hash = await asyncio.to_thread(auth_manager.hash_password, user_data.password)
     
     # Prepare user data for DynamoDB
     user_db_data = {
@@ -155,8 +272,8 @@ def signup_user(user_data: UserSignupRequest):
         'metadata': user_data.metadata
     }
     
-    # Create new user in DynamoDB
-    new_user = db_client.create_user(user_db_data)
+    # Create new user in DynamoDB; the username sentinel claim raises 400 if the name is taken
+    new_user = await asyncio.to_thread(db_client.create_user, user_db_data)
     
     # Create access token
     access_token = auth_manager.create_access_token(
@@ -164,30 +281,17 @@ def signup_user(user_data: UserSignupRequest):
     )
     
     # Convert to response model
-    user_response = UserResponse(
-        id=new_user['userId'],
-        name=new_user['name'],
-        username=new_user['username'],
-        age=new_user['preferences']['age'],
-        academicLevel=new_user['preferences']['academicLevel'],
-        major=new_user['preferences']['major'],
-        dyslexiaSupport=new_user['preferences']['dyslexiaSupport'],
-        languagePreference=new_user['preferences']['languagePreference'],
-        learningStyles=new_user['preferences']['learningStyles'],
-        metadata=new_user['preferences']['metadata'],
-        created_at=new_user['createdAt']
-    )
+    user_response = UserResponse.from_db(new_user)
     
     return AuthResponse(access_token=access_token, user=user_response)
 
-@app.post("/api/auth/signin", response_model=AuthResponse, tags=["Authentication"])
-def signin_user(signin_data: UserSigninRequest):
-    """
-    User signin. Returns auth token if credentials are valid.
-    No API key required for signin.
-    """
-    # Find user
-    user = db_client.get_user_by_username(signin_data.username)
+# Sign-ins in flight, keyed by username + keyed password digest so only identical attempts are shared
+_inflight_signins: Dict[tuple, "asyncio.Future[Dict[str, Any]]"] = {}
+_SIGNIN_KEY_SECRET = secrets.token_bytes(32)
+
+async def _authenticate_user(username: str, password: str) -> Dict[str, Any]:
+    """Look up and verify a user, lazily upgrading the stored hash. Raises 401 on bad credentials."""
+    user = await asyncio.to_thread(db_client.get_user_by_username, username)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -195,105 +299,105 @@ def signin_user(signin_data: UserSigninRequest):
         )
     
     # Verify password
-    if not auth_manager.verify_password(signin_data.password, user['passwordHash']):
+    if not await asyncio.to_thread(auth_manager.verify_password, password, user['passwordHash']):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password"
         )
     
+    # Lazily upgrade bcrypt / outdated argon2 hashes now that we have the plaintext
+    if auth_manager.password_needs_rehash(user['passwordHash']):
+        try:
+            new_hash = await asyncio.to_thread(auth_manager.hash_password, password)
+            await asyncio.to_thread(db_client.update_password_hash, user['userId'], new_hash)
+        except Exception as e:
+            logger.warning("⚠️ Password rehash failed for %s: %s", user['userId'], e)
+    
+    return user
+
+async def _authenticate_user_once(username: str, password: str) -> Dict[str, Any]:
+    """Single-flight wrapper: concurrent identical sign-ins share one lookup + verify."""
+    key = (username, hmac.new(_SIGNIN_KEY_SECRET, password.encode(), hashlib.sha256).digest())
+    inflight = _inflight_signins.get(key)
+    if inflight is not None:
+        try:
+            return await asyncio.shield(inflight)
+        except asyncio.CancelledError:
+            # The leader's request was cancelled, not ours: authenticate on our own
+            if asyncio.current_task().cancelling():
+                raise
+            return await _authenticate_user_once(username, password)
+    
+    # No await between the lookup above and this insert, so no lock is needed on the event loop
+    future = asyncio.get_running_loop().create_future()
+    # Mark failures as retrieved even when no other caller joined
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    _inflight_signins[key] = future
+    try:
+        user = await _authenticate_user(username, password)
+        future.set_result(user)
+        return user
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        if not future.done():
+            future.cancel()
+        _inflight_signins.pop(key, None)
+
+@app.post("/api/auth/signin", response_model=AuthResponse, tags=["Authentication"])
+async def signin_user(signin_data: UserSigninRequest):
+    """
+    User signin. Returns auth token if credentials are valid.
+    No API key required for signin.
+    """
+    user = await _authenticate_user_once(signin_data.username, signin_data.password)
+    
     # Create access token
     access_token = auth_manager.create_access_token(
         data={"user_id": user['userId'], "username": user['username']}
     )
     
     # Convert to response model
-    user_response = UserResponse(
-        id=user['userId'],
-        name=user['name'],
-        username=user['username'],
-        age=user['preferences']['age'],
-        academicLevel=user['preferences']['academicLevel'],
-        major=user['preferences']['major'],
-        dyslexiaSupport=user['preferences']['dyslexiaSupport'],
-        languagePreference=user['preferences']['languagePreference'],
-        learningStyles=user['preferences']['learningStyles'],
-        metadata=user['preferences']['metadata'],
-        created_at=user['createdAt']
-    )
+    user_response = UserResponse.from_db(user)
     
     return AuthResponse(access_token=access_token, user=user_response)
 
 @app.get("/api/user/profile", response_model=UserResponse, tags=["User Management"])
-def get_user_profile(
-    user_id: str = Depends(get_current_user_from_token),
-    api_key: str = Depends(validate_api_key)
+async def get_user_profile(
+    user_id: str = Depends(get_current_user_from_token)
 ):
     """Get current user's profile. Requires API key + JWT token authentication."""
-    user = db_client.get_user_by_id(user_id)
+    user = await asyncio.to_thread(db_client.get_user_by_id, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    return UserResponse(
-        id=user['userId'],
-        name=user['name'],
-        username=user['username'],
-        age=user['preferences']['age'],
-        academicLevel=user['preferences']['academicLevel'],
-        major=user['preferences']['major'],
-        dyslexiaSupport=user['preferences']['dyslexiaSupport'],
-        languagePreference=user['preferences']['languagePreference'],
-        learningStyles=user['preferences']['learningStyles'],
-        metadata=user['preferences']['metadata'],
-        created_at=user['createdAt']
-    )
+    return UserResponse.from_db(user)
 
 @app.put("/api/user/preferences", response_model=UserResponse, tags=["User Management"])
-def update_user_preferences(
+async def update_user_preferences(
     preferences: UserPreferencesUpdate,
-    user_id: str = Depends(get_current_user_from_token),
-    api_key: str = Depends(validate_api_key)
+    user_id: str = Depends(get_current_user_from_token)
 ):
     """Update user preferences. Requires API key + JWT token authentication."""
-    # Get current user to verify existence
-    current_user = db_client.get_user_by_id(user_id)
-    if not current_user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
+    # Update only provided fields (404s via the update's existence condition)
+    update_data = preferences.model_dump(exclude_unset=True)
+    updated_user = await asyncio.to_thread(db_client.update_user_preferences, user_id, update_data)
     
-    # Update only provided fields
-    update_data = preferences.dict(exclude_unset=True)
-    updated_user = db_client.update_user_preferences(user_id, update_data)
-    
-    return UserResponse(
-        id=updated_user['userId'],
-        name=updated_user['name'],
-        username=updated_user['username'],
-        age=updated_user['preferences']['age'],
-        academicLevel=updated_user['preferences']['academicLevel'],
-        major=updated_user['preferences']['major'],
-        dyslexiaSupport=updated_user['preferences']['dyslexiaSupport'],
-        languagePreference=updated_user['preferences']['languagePreference'],
-        learningStyles=updated_user['preferences']['learningStyles'],
-        metadata=updated_user['preferences']['metadata'],
-        created_at=updated_user['createdAt']
-    )
+    return UserResponse.from_db(updated_user)
 
 @app.post("/api/extract-audio", tags=["Video Processing"])
 async def extract_audio_from_video(
-    video: UploadFile = File(...),
-    api_key: str = Depends(validate_api_key)
+    video: UploadFile = File(...)
 ):
     """
     Extract audio from uploaded video file (Step 1 of video processing).
     
     Args:
         video: Video file to extract audio from
-        api_key: API authentication key
     
     Returns:
         Dict containing video info, audio info, and extraction metadata
@@ -304,18 +408,15 @@ async def extract_audio_from_video(
         raise HTTPException(status_code=400, detail="File must be a video")
     
     # Check file size (limit to 100MB for hackathon)
-    if video.size and video.size > 100 * 1024 * 1024:
+    if video.size and video.size > MAX_VIDEO_UPLOAD_BYTES:
         raise HTTPException(status_code=400, detail="Video file too large (max 100MB)")
     
     # Save uploaded file temporarily
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as temp_video:
-        content = await video.read()
-        temp_video.write(content)
-        temp_video_path = temp_video.name
+    temp_video_path = await save_upload_to_temp(video)
     
     try:
         # Extract audio with detailed info
-        result = video_processor.extract_audio(temp_video_path, return_info=True)
+        result = await asyncio.to_thread(video_processor.extract_audio, temp_video_path, return_info=True)
         
         # Add upload metadata
         result["upload_info"] = {
@@ -333,7 +434,7 @@ async def extract_audio_from_video(
         raise HTTPException(status_code=500, detail=f"Audio extraction failed: {str(e)}")
     finally:
         # Cleanup video file
-        if os.path.exists(temp_video_path):
+        with contextlib.suppress(FileNotFoundError):
             os.unlink(temp_video_path)
 
 @app.post("/api/gemini-transcribe", tags=["Video Processing"])
@@ -343,8 +444,7 @@ async def gemini_transcribe_audio(
     academic_level: Optional[str] = Form(default="general"),
     mode: Optional[str] = Form(default="speed"),
     model: Optional[str] = Form(default=None),
-    work_orders_mode: Optional[str] = Form(default="guided"),
-    api_key: str = Depends(validate_api_key)
+    work_orders_mode: Optional[str] = Form(default="guided")
 ):
     """
     🏆 GEMINI-POWERED: Convert audio to intelligent educational analysis.
@@ -356,7 +456,6 @@ async def gemini_transcribe_audio(
         audio_file_path: Path to the extracted audio file (from /api/extract-audio)
         user_background: User's field of study (e.g., "Computer Science", "Physics")
         academic_level: User's academic level (e.g., "High School", "College")
-        api_key: API authentication key
     
     Returns:
         Dict containing Gemini's intelligent analysis of the educational content
@@ -386,7 +485,7 @@ async def gemini_transcribe_audio(
         }
         
         # Use Gemini for intelligent analysis
-        result = gemini_agent.transcribe_and_analyze(audio_file_path, user_context)
+        result = await asyncio.to_thread(gemini_agent.transcribe_and_analyze, audio_file_path, user_context)
         
         # Add processing metadata
         result["processing_info"] = {
@@ -412,11 +511,11 @@ async def gemini_transcribe_audio(
         raise HTTPException(status_code=500, detail=f"Gemini processing failed: {str(e)}")
     finally:
         # Cleanup audio file after processing
-        if os.path.exists(audio_file_path):
+        with contextlib.suppress(FileNotFoundError):
             os.unlink(audio_file_path)
 
 @app.get("/api/gemini-capabilities", tags=["Video Processing"])
-def get_gemini_capabilities(api_key: str = Depends(validate_api_key)):
+async def get_gemini_capabilities():
     """🏆 SHOWCASE: Display Google Gemini's unique capabilities for the prize."""
     if not gemini_agent:
         return {"error": "Gemini not available", "setup_required": "GOOGLE_GEMINI_API_KEY"}
@@ -424,7 +523,7 @@ def get_gemini_capabilities(api_key: str = Depends(validate_api_key)):
     return gemini_agent.get_gemini_capabilities()
 
 @app.get("/api/orchestrator-info", tags=["Video Processing"])
-def get_orchestrator_info(api_key: str = Depends(validate_api_key)):
+async def get_orchestrator_info():
     """🎯 SHOWCASE: Display Content Orchestrator and specialized agents information."""
     if not content_orchestrator:
         return {"error": "Content orchestrator not available", "setup_required": "GOOGLE_GEMINI_API_KEY"}
@@ -434,8 +533,7 @@ def get_orchestrator_info(api_key: str = Depends(validate_api_key)):
 @app.post("/api/test-single-agent", tags=["Debug"])
 async def test_single_agent(
     agent_name: str = Form(...),
-    test_work_order: str = Form(default='{"brief": "test", "bullets": ["test1", "test2"]}'),
-    api_key: str = Depends(validate_api_key)
+    test_work_order: str = Form(default='{"brief": "test", "bullets": ["test1", "test2"]}')
 ):
     """🔧 DEBUG: Test a single agent to identify performance bottlenecks."""
     if not content_orchestrator:
@@ -445,24 +543,12 @@ async def test_single_agent(
         import json
         work_order = json.loads(test_work_order)
         
-        # Mock context for testing
-        mock_gemini_analysis = {
-            "educational_analysis": {
-                "subject": "Chemistry",
-                "topic": "Chemical Bonds"
-            }
-        }
-        mock_user_context = {
-            "major": "Computer Science",
-            "academicLevel": "College"
-        }
-        
-        print(f"🧪 Testing single agent: {agent_name}")
-        print(f"📋 Available agents: {list(content_orchestrator.agents.keys())}")
+        logger.info("🧪 Testing single agent: %s", agent_name)
+        logger.info("📋 Available agents: %s", list(content_orchestrator.agents))
         
         # Use the new orchestrator method for consistent execution
         result = await content_orchestrator.run_single_agent(
-            agent_name, work_order, mock_gemini_analysis, mock_user_context
+            agent_name, work_order, DEBUG_GEMINI_ANALYSIS, DEBUG_USER_CONTEXT
         )
         
         return result
@@ -475,8 +561,43 @@ async def test_single_agent(
             "test_work_order": test_work_order
         }
 
+@app.post("/api/test-all-agents", tags=["Debug"])
+async def test_all_agents(
+    batch: AgentBatchTestRequest
+):
+    """🔧 DEBUG: Run several agents concurrently in one request (one auth check, one round-trip)."""
+    if not content_orchestrator:
+        raise HTTPException(status_code=503, detail="Content orchestrator not available")
+    
+    logger.info("🧪 Testing %d agents in one batch: %s", len(batch.agents), ', '.join(batch.agents))
+    start_time = time.monotonic()
+    
+    async def _bounded(agent_name: str) -> Dict[str, Any]:
+        # Each agent gets its own budget so a straggler never stalls its siblings
+        try:
+            async with asyncio.timeout(DEBUG_AGENT_TIMEOUT_SECONDS):
+                return await content_orchestrator.run_single_agent(
+                    agent_name, batch.work_order, DEBUG_GEMINI_ANALYSIS, DEBUG_USER_CONTEXT
+                )
+        except TimeoutError:
+            error = f"Timed out after {DEBUG_AGENT_TIMEOUT_SECONDS}s"
+        except HTTPException as e:
+            error = e.detail
+        except Exception as e:
+            error = str(e)
+        return {"agent_type": agent_name, "status": "failed", "error": error}
+    
+    async with asyncio.TaskGroup() as tg:
+        tasks = {agent_name: tg.create_task(_bounded(agent_name)) for agent_name in batch.agents}
+    results = {agent_name: task.result() for agent_name, task in tasks.items()}
+    
+    return {
+        "results": results,
+        "total_time": time.monotonic() - start_time
+    }
+
 @app.get("/api/view-content/{format_name}", tags=["Video Processing"])
-def view_content_format(format_name: str, api_key: str = Depends(validate_api_key)):
+async def view_content_format(format_name: str):
     """📺 VIEW: Display generated content in readable format for frontend preview."""
     
     # This would normally come from a database or cache
@@ -539,8 +660,7 @@ async def process_video_pipeline(
     academic_level: Optional[str] = Form(default="general"),
     mode: Optional[str] = Form(default="speed"),
     model: Optional[str] = Form(default=None),
-    work_orders_mode: Optional[str] = Form(default="guided"),
-    api_key: str = Depends(validate_api_key)
+    work_orders_mode: Optional[str] = Form(default="guided")
 ):
     """
     Single pipeline: upload video -> extract audio -> Gemini Flash analysis + content strategy.
@@ -550,16 +670,13 @@ async def process_video_pipeline(
 
     if not video.content_type or not video.content_type.startswith('video/'):
         raise HTTPException(status_code=400, detail="File must be a video")
-    if video.size and video.size > 100 * 1024 * 1024:
+    if video.size and video.size > MAX_VIDEO_UPLOAD_BYTES:
         raise HTTPException(status_code=400, detail="Video file too large (max 100MB)")
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as temp_video:
-        content = await video.read()
-        temp_video.write(content)
-        temp_video_path = temp_video.name
+    temp_video_path = await save_upload_to_temp(video)
 
     try:
-        extraction = video_processor.extract_audio(temp_video_path, return_info=True)
+        extraction = await asyncio.to_thread(video_processor.extract_audio, temp_video_path, return_info=True)
         audio_path = extraction["audio_path"] if isinstance(extraction, dict) else extraction
 
         user_context = {
@@ -570,7 +687,7 @@ async def process_video_pipeline(
             "work_orders_mode": work_orders_mode
         }
 
-        analysis = gemini_agent.transcribe_and_analyze(audio_path, user_context)
+        analysis = await asyncio.to_thread(gemini_agent.transcribe_and_analyze, audio_path, user_context)
         return {
             "pipeline": "video->audio->gemini",
             "extraction": extraction,
@@ -579,7 +696,7 @@ async def process_video_pipeline(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Pipeline failed: {str(e)}")
     finally:
-        if os.path.exists(temp_video_path):
+        with contextlib.suppress(FileNotFoundError):
             os.unlink(temp_video_path)
 
 @app.post("/api/process-video-complete", tags=["Video Processing"])
@@ -590,8 +707,7 @@ async def process_video_complete_pipeline(
     mode: Optional[str] = Form(default="speed"),
     model: Optional[str] = Form(default=None),
     work_orders_mode: Optional[str] = Form(default="guided"),
-    auth_token: Optional[str] = Form(default=None),
-    api_key: str = Depends(validate_api_key)
+    auth_token: Optional[str] = Form(default=None)
 ):
     """
     🚀 COMPLETE PIPELINE: Video → Audio → Gemini Analysis → 6 Specialized Agents → Learning Formats
@@ -621,17 +737,14 @@ async def process_video_complete_pipeline(
 
     if not video.content_type or not video.content_type.startswith('video/'):
         raise HTTPException(status_code=400, detail="File must be a video")
-    if video.size and video.size > 100 * 1024 * 1024:
+    if video.size and video.size > MAX_VIDEO_UPLOAD_BYTES:
         raise HTTPException(status_code=400, detail="Video file too large (max 100MB)")
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as temp_video:
-        content = await video.read()
-        temp_video.write(content)
-        temp_video_path = temp_video.name
+    temp_video_path = await save_upload_to_temp(video)
 
     try:
-        print("🎬 Step 1: Extracting audio from video...")
-        extraction = video_processor.extract_audio(temp_video_path, return_info=True)
+        logger.info("🎬 Step 1: Extracting audio from video...")
+        extraction = await asyncio.to_thread(video_processor.extract_audio, temp_video_path, return_info=True)
         audio_path = extraction["audio_path"] if isinstance(extraction, dict) else extraction
 
         # Build user context - start with form parameters as defaults
@@ -646,10 +759,10 @@ async def process_video_complete_pipeline(
         # If auth_token provided, get user profile and merge preferences
         if auth_token:
             try:
-                print("👤 Getting user profile from auth token...")
-                user_id = get_current_user_id(f"Bearer {auth_token}")
+                logger.info("👤 Getting user profile from auth token...")
+                user_id = decode_user_id(auth_token)
                 if user_id:
-                    user_profile = db_client.get_user_by_id(user_id)
+                    user_profile = await asyncio.to_thread(db_client.get_user_by_id, user_id)
                     if user_profile and 'preferences' in user_profile:
                         prefs = user_profile['preferences']
                         # Override defaults with user preferences
@@ -663,19 +776,19 @@ async def process_video_complete_pipeline(
                             "userName": user_profile.get('name'),
                             "userId": user_id
                         })
-                        print(f"✅ Enhanced context with user preferences for: {user_profile.get('name')}")
+                        logger.info("✅ Enhanced context with user preferences for: %s", user_profile.get('name'))
                     else:
-                        print("⚠️ User profile not found or missing preferences")
+                        logger.warning("⚠️ User profile not found or missing preferences")
                 else:
-                    print("⚠️ Invalid auth token - user ID not found")
+                    logger.warning("⚠️ Invalid auth token - user ID not found")
             except Exception as e:
-                print(f"⚠️ Error retrieving user profile: {str(e)} - continuing with form parameters")
+                logger.warning("⚠️ Error retrieving user profile: %s - continuing with form parameters", e)
                 # Continue with form parameters if auth fails
 
-        print("🧠 Step 2: Gemini analysis and work order generation...")
-        analysis = gemini_agent.transcribe_and_analyze(audio_path, user_context)
+        logger.info("🧠 Step 2: Gemini analysis and work order generation...")
+        analysis = await asyncio.to_thread(gemini_agent.transcribe_and_analyze, audio_path, user_context)
         
-        print("🎯 Step 3: Orchestrating 8 specialized content agents...")
+        logger.info("🎯 Step 3: Orchestrating 8 specialized content agents...")
         work_orders = analysis.get("work_orders", {})
         gemini_analysis = analysis.get("gemini_analysis", {})
         
@@ -686,7 +799,7 @@ async def process_video_complete_pipeline(
             user_context=user_context
         )
         
-        print("🎉 Complete pipeline finished successfully!")
+        logger.info("🎉 Complete pipeline finished successfully!")
         
         return {
             "pipeline": "video->audio->gemini->orchestrator->8_agents",
@@ -705,11 +818,11 @@ async def process_video_complete_pipeline(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Complete pipeline failed: {str(e)}")
     finally:
-        if os.path.exists(temp_video_path):
+        with contextlib.suppress(FileNotFoundError):
             os.unlink(temp_video_path)
 
 @app.get("/api/processing-status/{job_id}", tags=["Video Processing"])
-def get_processing_status(job_id: str, api_key: str = Depends(validate_api_key)):
+async def get_processing_status(job_id: str):
     """Get status of video processing job (for future async implementation)."""
     # Placeholder for async job status tracking
     return {"job_id": job_id, "status": "completed", "message": "Sync processing complete"}
@@ -720,4 +833,5 @@ handler = Mangum(app)
 # For local development
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # uvicorn[standard] ships uvloop and httptools; pin them rather than relying on auto-detection
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, loop="uvloop", http="httptools")
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, validator
-from typing import List, Optional, Any, Dict
+from pydantic import BaseModel, ConfigDict, ValidationInfo, field_validator
+from typing import List, Literal, Optional, Any, Dict
 from datetime import datetime
 
 class UserSignupRequest(BaseModel):
@@ -15,19 +15,22 @@ class UserSignupRequest(BaseModel):
     learningStyles: List[str] = []
     metadata: List[Any] = []
     
-    @validator('confirmPassword')
-    def passwords_match(cls, v, values, **kwargs):
-        if 'password' in values and v != values['password']:
+    @field_validator('confirmPassword')
+    @classmethod
+    def passwords_match(cls, v, info: ValidationInfo):
+        if 'password' in info.data and v != info.data['password']:
             raise ValueError('Passwords do not match')
         return v
     
-    @validator('username')
+    @field_validator('username')
+    @classmethod
     def username_valid(cls, v):
         if len(v) < 3:
             raise ValueError('Username must be at least 3 characters')
         return v
     
-    @validator('age')
+    @field_validator('age')
+    @classmethod
     def age_valid(cls, v):
         if v < 5 or v > 120:
             raise ValueError('Age must be between 5 and 120')
@@ -48,6 +51,8 @@ class UserPreferencesUpdate(BaseModel):
     metadata: Optional[List[Any]] = None
 
 class UserResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
     id: str  # Changed from int to str for DynamoDB UUID
     name: str
     username: str
@@ -60,8 +65,23 @@ class UserResponse(BaseModel):
     metadata: List[Any]
     created_at: str  # Changed from datetime to str for DynamoDB ISO format
     
-    class Config:
-        from_attributes = True
+    @classmethod
+    def from_db(cls, user: Dict[str, Any]) -> "UserResponse":
+        """Build from a trusted DynamoDB user item, skipping validation."""
+        p = user['preferences']
+        return cls.model_construct(
+            id=user['userId'],
+            name=user['name'],
+            username=user['username'],
+            age=int(p['age']),  # DynamoDB numbers come back as Decimal
+            academicLevel=p['academicLevel'],
+            major=p['major'],
+            dyslexiaSupport=p['dyslexiaSupport'],
+            languagePreference=p['languagePreference'],
+            learningStyles=p['learningStyles'],
+            metadata=p['metadata'],
+            created_at=user['createdAt']
+        )
 
 class AuthResponse(BaseModel):
     access_token: str
@@ -78,3 +98,30 @@ class VideoProcessingRequest(BaseModel):
     language_preference: Optional[str] = None
     dyslexia_support: Optional[bool] = None
     learning_styles: Optional[List[str]] = None
+
+class AgentBatchTestRequest(BaseModel):
+    agents: List[str]
+    work_order: Dict[str, Any] = {"brief": "test", "bullets": ["test1", "test2"]}
+
+class ConceptAnalysis(BaseModel):
+    """Structured-output schema for transcript concept extraction."""
+    topic: str
+    concepts: List[str]
+    objectives: List[str]
+    difficulty: Literal["beginner", "intermediate", "advanced"]
+    duration: int  # Estimated minutes
+
+class TranscriptData(BaseModel):
+    text: str
+    language: str
+
+class ConceptExtraction(BaseModel):
+    analysis: ConceptAnalysis
+    word_count: int
+    estimated_duration: int
+
+class VideoExtractionResult(BaseModel):
+    """process_video result; also validates entries recalled from the extraction cache."""
+    transcript: TranscriptData
+    concepts: ConceptExtraction
+    status: Literal["success"]
@@ -1,8 +1,13 @@
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from jose import jwt, JWTError
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional, Tuple
+import math
 import os
+import time
 from fastapi import HTTPException, status
 
 # Simple JWT configuration for hackathon
@@ -10,24 +15,40 @@ JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "vthacks_2025_jwt_secret_key_for_de
 JWT_ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 24
 
+# argon2id at the OWASP baseline (19 MiB, 2 passes, 1 lane); bcrypt hashes are still accepted and upgraded on signin.
+# Override per deployment to hit ~50 ms per hash; stored hashes are upgraded to new parameters on signin.
+_password_hasher = PasswordHasher(
+    time_cost=int(os.getenv("ARGON2_TIME_COST", "2")),
+    memory_cost=int(os.getenv("ARGON2_MEMORY_COST_KIB", "19456")),
+    parallelism=int(os.getenv("ARGON2_PARALLELISM", "1"))
+)
+
 class AuthManager:
     @staticmethod
     def hash_password(password: str) -> str:
-        """Hash a password using bcrypt."""
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
+        """Hash a password using argon2id."""
+        return _password_hasher.hash(password)
     
     @staticmethod
     def verify_password(password: str, hashed_password: str) -> bool:
-        """Verify a password against its hash."""
-        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+        """Verify a password against its hash (argon2id, or legacy bcrypt)."""
+        if hashed_password.startswith("$2"):
+            return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+        try:
+            return _password_hasher.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    
+    @staticmethod
+    def password_needs_rehash(hashed_password: str) -> bool:
+        """Whether a stored hash is bcrypt or uses outdated argon2 parameters."""
+        return hashed_password.startswith("$2") or _password_hasher.check_needs_rehash(hashed_password)
     
     @staticmethod
     def create_access_token(data: dict) -> str:
         """Create a JWT access token."""
         to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
+        expire = datetime.now(timezone.utc) + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
         to_encode.update({"exp": expire})
         
         encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
@@ -51,14 +72,19 @@ class AuthManager:
                     detail="Invalid token"
                 )
 
-def get_current_user_id(authorization: Optional[str] = None) -> Optional[str]:
-    """Extract user ID from JWT token (optional for hackathon demo)."""
-    if not authorization or not authorization.startswith("Bearer "):
-        return None
-    
-    token = authorization.split(" ")[1]
+@lru_cache(maxsize=4096)
+def _decode_user_token(token: str) -> Tuple[Optional[str], float]:
+    """Verify a token once and return (user_id, exp); tokens are immutable, so the result holds until exp."""
     try:
         payload = AuthManager.verify_token(token)
-        return payload.get("user_id")
     except (HTTPException, JWTError):
+        return None, math.inf
+    return payload.get("user_id"), payload.get("exp", math.inf)
+
+def decode_user_id(token: str) -> Optional[str]:
+    """User ID from a bare JWT (no "Bearer " prefix), or None if invalid or expired."""
+    user_id, expires_at = _decode_user_token(token)
+    # Cached verifications still expire on time
+    if time.time() >= expires_at:
         return None
+    return user_id
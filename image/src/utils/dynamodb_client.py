@@ -1,19 +1,85 @@
 import boto3
 import os
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime, timezone
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from fastapi import HTTPException, status
 import uuid
 
+# Keep-alive connection pool shared by every request so TLS setup is paid once, not per operation.
+# Single-item calls answer in milliseconds, so short timeouts let adaptive retries replace a stalled socket quickly.
+DEFAULT_BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    connect_timeout=1,
+    read_timeout=2,
+    retries={'total_max_attempts': 3, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+
+# Usernames are claimed by a sentinel row in the users table so uniqueness is enforced at write time
+USERNAME_SENTINEL_PREFIX = 'USERNAME#'
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def _utc_timestamp() -> str:
+    """Timezone-aware ISO-8601 UTC timestamp for createdAt/updatedAt."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+@lru_cache(maxsize=256)
+def _preferences_update_expression(fields: frozenset) -> Tuple[str, Dict[str, str]]:
+    """UpdateExpression and attribute names for one set of preference fields, built once per set."""
+    update_expression = "SET updatedAt = :timestamp"
+    expression_names = {}
+    for key in sorted(fields):
+        if key == 'name':
+            # Handle 'name' as top-level field (reserved keyword)
+            expression_names['#n'] = 'name'
+            update_expression += f", #n = :{key}"
+        else:
+            # All other fields (including age) go into preferences
+            update_expression += f", preferences.{key} = :{key}"
+    return update_expression, expression_names
+
+def _to_attribute_values(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Serialize a plain item into AttributeValues for the low-level client."""
+    return {key: _serializer.serialize(value) for key, value in item.items()}
+
+def _from_attribute_values(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Deserialize AttributeValues from the low-level client into a plain item."""
+    return {key: _deserializer.deserialize(value) for key, value in item.items()}
+
+# Write-through cache for get_user_by_id; profile reads repeat far more often than preference updates
+USER_CACHE_TTL_SECONDS = 60
+USER_CACHE_MAX_ENTRIES = 10_000
+
 class DynamoDBClient:
-    def __init__(self):
+    def __init__(self, config: Optional[Config] = None):
         # Initialize DynamoDB client
         self.dynamodb = boto3.resource(
             'dynamodb',
             region_name=os.getenv('AWS_REGION', 'us-east-1'),
             aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
+            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+            config=config or DEFAULT_BOTO_CONFIG
+        )
+        
+        # Low-level client for the hot paths: items go out pre-serialized, skipping the resource's
+        # per-call transformation pass over every nested attribute
+        self.client = boto3.client(
+            'dynamodb',
+            region_name=os.getenv('AWS_REGION', 'us-east-1'),
+            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+            config=config or DEFAULT_BOTO_CONFIG
         )
         
         # Table name
@@ -21,6 +87,18 @@ class DynamoDBClient:
         
         # Get table reference
         self.users_table = self.dynamodb.Table(self.users_table_name)
+        
+        # userId -> (monotonic timestamp, item); sync routes run on worker threads, hence the lock
+        self._user_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._user_cache_lock = threading.Lock()
+    
+    def _cache_user(self, item: Dict[str, Any]) -> None:
+        """Store a fresh user item, evicting the least recently used entries past the cap."""
+        with self._user_cache_lock:
+            self._user_cache[item['userId']] = (time.monotonic(), item)
+            self._user_cache.move_to_end(item['userId'])
+            while len(self._user_cache) > USER_CACHE_MAX_ENTRIES:
+                self._user_cache.popitem(last=False)
     
     def create_table_if_not_exist(self):
         """Create DynamoDB users table if it doesn't exist (for local development)."""
@@ -75,7 +153,7 @@ class DynamoDBClient:
     def create_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new user in DynamoDB."""
         user_id = str(uuid.uuid4())
-        timestamp = datetime.utcnow().isoformat()
+        timestamp = _utc_timestamp()
         
         item = {
             'userId': user_id,
@@ -95,14 +173,41 @@ class DynamoDBClient:
             'updatedAt': timestamp
         }
         
+        sentinel = {
+            'userId': {'S': f"{USERNAME_SENTINEL_PREFIX}{user_data['username']}"},
+            'ownerId': {'S': user_id}
+        }
+        
         try:
-            self.users_table.put_item(
-                Item=item,
-                ConditionExpression='attribute_not_exists(userId)'
+            # User row and username claim succeed or fail together in one round-trip
+            self.client.transact_write_items(
+                TransactItems=[
+                    {
+                        'Put': {
+                            'TableName': self.users_table_name,
+                            'Item': _to_attribute_values(item),
+                            'ConditionExpression': 'attribute_not_exists(userId)'
+                        }
+                    },
+                    {
+                        'Put': {
+                            'TableName': self.users_table_name,
+                            'Item': sentinel,
+                            'ConditionExpression': 'attribute_not_exists(userId)'
+                        }
+                    }
+                ]
             )
+            self._cache_user(item)
             return item
         except ClientError as e:
-            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            if e.response['Error']['Code'] == 'TransactionCanceledException':
+                reasons = e.response.get('CancellationReasons', [])
+                if len(reasons) > 1 and reasons[1].get('Code') == 'ConditionalCheckFailed':
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Username already registered"
+                    )
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="User already exists"
@@ -112,69 +217,122 @@ class DynamoDBClient:
                 detail=f"Failed to create user: {str(e)}"
             )
     
+    def backfill_username_sentinels(self) -> int:
+        """Claim usernames for accounts created before sentinels existed (run once via migrate_username_sentinels.py)."""
+        claimed = 0
+        scan_params = {'ProjectionExpression': 'userId, username'}
+        while True:
+            response = self.users_table.scan(**scan_params)
+            for user in response.get('Items', []):
+                if 'username' not in user:
+                    continue
+                try:
+                    self.users_table.put_item(
+                        Item={'userId': f"{USERNAME_SENTINEL_PREFIX}{user['username']}", 'ownerId': user['userId']},
+                        ConditionExpression='attribute_not_exists(userId)'
+                    )
+                    claimed += 1
+                except ClientError as e:
+                    if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                        raise
+            if 'LastEvaluatedKey' not in response:
+                return claimed
+            scan_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
     def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
-        """Get user by username using GSI."""
+        """Get user by username via its sentinel row (strongly consistent, unlike the GSI)."""
         try:
-            response = self.users_table.query(
-                IndexName='username-index',
-                KeyConditionExpression='username = :username',
-                ExpressionAttributeValues={':username': username}
+            response = self.client.get_item(
+                TableName=self.users_table_name,
+                Key={'userId': {'S': f"{USERNAME_SENTINEL_PREFIX}{username}"}},
+                ProjectionExpression='ownerId',
+                ConsistentRead=True
             )
-            
-            items = response.get('Items', [])
-            return items[0] if items else None
+            sentinel = response.get('Item')
+            # A fresh owner row comes from the write-through cache; otherwise this is a second get_item
+            return self.get_user_by_id(sentinel['ownerId']['S']) if sentinel else None
             
         except ClientError as e:
             print(f"Error querying user by username: {e}")
             return None
     
     def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """Get user by user ID."""
+        """Get user by user ID (served from the write-through cache when fresh)."""
+        with self._user_cache_lock:
+            cached = self._user_cache.get(user_id)
+            if cached and time.monotonic() - cached[0] < USER_CACHE_TTL_SECONDS:
+                self._user_cache.move_to_end(user_id)
+                return cached[1]
+        
         try:
-            response = self.users_table.get_item(
-                Key={'userId': user_id}
+            response = self.client.get_item(
+                TableName=self.users_table_name,
+                Key={'userId': {'S': user_id}}
             )
-            return response.get('Item')
+            if 'Item' not in response:
+                return None
+            item = _from_attribute_values(response['Item'])
+            self._cache_user(item)
+            return item
             
         except ClientError as e:
             print(f"Error getting user by ID: {e}")
             return None
     
+    def update_password_hash(self, user_id: str, password_hash: str) -> None:
+        """Replace a user's stored password hash (used to upgrade legacy hashes on signin)."""
+        try:
+            response = self.client.update_item(
+                TableName=self.users_table_name,
+                Key={'userId': {'S': user_id}},
+                UpdateExpression="SET passwordHash = :hash, updatedAt = :timestamp",
+                ExpressionAttributeValues={
+                    ':hash': {'S': password_hash},
+                    ':timestamp': {'S': _utc_timestamp()}
+                },
+                ReturnValues='ALL_NEW'
+            )
+            self._cache_user(_from_attribute_values(response['Attributes']))
+        except ClientError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to update user: {str(e)}"
+            )
+    
     def update_user_preferences(self, user_id: str, preferences: Dict[str, Any]) -> Dict[str, Any]:
         """Update user preferences."""
         try:
-            # Build update expression with reserved keyword handling
-            update_expression = "SET updatedAt = :timestamp"
-            expression_values = {':timestamp': datetime.utcnow().isoformat()}
-            expression_names = {}
-            
-            for key, value in preferences.items():
-                if key == 'name':
-                    # Handle 'name' as top-level field (reserved keyword)
-                    expression_names['#n'] = 'name'
-                    update_expression += f", #n = :{key}"
-                    expression_values[f':{key}'] = value
-                else:
-                    # All other fields (including age) go into preferences
-                    update_expression += f", preferences.{key} = :{key}"
-                    expression_values[f':{key}'] = value
+            update_expression, expression_names = _preferences_update_expression(frozenset(preferences))
+            expression_values = {f':{key}': _serializer.serialize(value) for key, value in preferences.items()}
+            expression_values[':timestamp'] = {'S': _utc_timestamp()}
             
             update_params = {
-                'Key': {'userId': user_id},
+                'TableName': self.users_table_name,
+                'Key': {'userId': {'S': user_id}},
                 'UpdateExpression': update_expression,
+                # Existence check in the same round-trip; without it UpdateItem would upsert a bare row
+                'ConditionExpression': 'attribute_exists(userId)',
                 'ExpressionAttributeValues': expression_values,
                 'ReturnValues': 'ALL_NEW'
             }
             
             # Add expression attribute names if we have any
             if expression_names:
-                update_params['ExpressionAttributeNames'] = expression_names
+                update_params['ExpressionAttributeNames'] = dict(expression_names)
             
-            response = self.users_table.update_item(**update_params)
+            response = self.client.update_item(**update_params)
             
-            return response['Attributes']
+            # ALL_NEW is the full item, so refresh the cache instead of just invalidating it
+            user = _from_attribute_values(response['Attributes'])
+            self._cache_user(user)
+            return user
             
         except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="User not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to update user: {str(e)}"
@@ -0,0 +1,77 @@
+import contextlib
+import hashlib
+import os
+import tempfile
+from typing import Any, Dict, Optional, Type
+
+import orjson
+from pydantic import BaseModel, ValidationError
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    """sha256 of a file's bytes, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Content-addressable JSON cache for video pipeline results on local disk.
+
+    Keys combine the video's sha256 with everything that shapes the output
+    (provider, models, prompt version), so changing any of them misses cleanly.
+    Recalled entries are re-validated against schema, if one is given.
+    """
+
+    def __init__(self, cache_dir: str, schema: Optional[Type[BaseModel]] = None):
+        self.cache_dir = cache_dir
+        self.schema = schema
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Length-prefix each part so ("ab", "c") and ("a", "bc") never collide."""
+        digest = hashlib.sha256()
+        for part in parts:
+            encoded = part.encode()
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result, or None on miss. Unreadable or schema-mismatched entries are evicted."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                result = orjson.loads(f.read())
+            if self.schema is not None:
+                result = self.schema.model_validate(result).model_dump()
+        except FileNotFoundError:
+            return None
+        except (OSError, orjson.JSONDecodeError, ValidationError):
+            result = None
+
+        if not isinstance(result, dict):
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+            return None
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Write atomically so concurrent readers never see a partial entry."""
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(result))
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
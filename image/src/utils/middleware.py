@@ -0,0 +1,108 @@
+import hmac
+from typing import Tuple
+
+
+def _encoded_error(status: int, detail: str) -> Tuple[dict, dict]:
+    """Pre-encode a JSON error as ASGI start/body messages."""
+    body = ('{"detail":"%s"}' % detail).encode()
+    start = {
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    }
+    return start, {"type": "http.response.body", "body": body}
+
+
+# Pre-encoded rejections so they never build Request/Response objects
+_UNAUTHORIZED = _encoded_error(401, "Invalid API key")
+_BAD_CONTENT_LENGTH = _encoded_error(400, "Invalid Content-Length header")
+_PAYLOAD_TOO_LARGE = _encoded_error(413, "Upload too large")
+_UNSUPPORTED_MEDIA_TYPE = _encoded_error(415, "Expected multipart/form-data upload")
+
+
+async def _send_error(send, messages: Tuple[dict, dict]) -> None:
+    await send(messages[0])
+    await send(messages[1])
+
+
+class ApiKeyASGIMiddleware:
+    """
+    Pure ASGI X-API-Key check for protected path prefixes.
+
+    Reads the header straight from the raw scope headers and short-circuits with
+    a pre-encoded 401, so protected endpoints need no per-route dependency.
+    """
+
+    def __init__(
+        self,
+        app,
+        api_key: str,
+        protected_prefixes: Tuple[str, ...] = ("/api/",),
+        exempt_prefixes: Tuple[str, ...] = ()
+    ):
+        self.app = app
+        self.api_key = api_key.encode()
+        self.protected_prefixes = protected_prefixes
+        self.exempt_prefixes = exempt_prefixes
+
+    def protects(self, path: str) -> bool:
+        """Whether requests to path must carry a valid API key."""
+        return path.startswith(self.protected_prefixes) and not path.startswith(self.exempt_prefixes)
+
+    async def __call__(self, scope, receive, send):
+        # CORS preflights never carry the key; let them through to the CORS layer
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or not self.protects(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"x-api-key":
+                if hmac.compare_digest(value, self.api_key):
+                    await self.app(scope, receive, send)
+                    return
+                break
+
+        await _send_error(send, _UNAUTHORIZED)
+
+
+class UploadGuardMiddleware:
+    """
+    Pure ASGI header check for upload endpoints.
+
+    Rejects POSTs whose Content-Length is malformed (400) or exceeds max_bytes
+    (413), or whose Content-Type is not multipart/form-data (415), before any
+    body frame is read.
+    Chunked uploads without Content-Length are still spooled by the multipart
+    parser; the handlers' copy then stops at the cap and discards the file.
+    """
+
+    def __init__(self, app, max_bytes: int, upload_prefixes: Tuple[str, ...]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.upload_prefixes = upload_prefixes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].startswith(self.upload_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        content_type = b""
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if not value.isdigit():
+                    await _send_error(send, _BAD_CONTENT_LENGTH)
+                    return
+                if int(value) > self.max_bytes:
+                    await _send_error(send, _PAYLOAD_TOO_LARGE)
+                    return
+            elif name == b"content-type":
+                content_type = value
+
+        if not content_type.lower().startswith(b"multipart/form-data"):
+            await _send_error(send, _UNSUPPORTED_MEDIA_TYPE)
+            return
+
+        await self.app(scope, receive, send)
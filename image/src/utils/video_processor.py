@@ -1,17 +1,90 @@
+import asyncio
+import contextlib
+import io
+import logging
 import os
 import subprocess
 import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Union
+from typing import Dict, Any, BinaryIO, List, Union
 
 import ffmpeg
+import httpx
 import openai
 from fastapi import HTTPException
 
+from models.schemas import ConceptAnalysis, VideoExtractionResult
+from utils.extraction_cache import ExtractionCache, hash_file
+
+logger = logging.getLogger(__name__)
+
+
+# Upper bound on concurrent OpenAI requests across all videos being processed
+OPENAI_MAX_CONCURRENCY = 8
+
+# Everything that shapes process_video output; bump the prompt version whenever a prompt changes
+TRANSCRIPTION_MODEL = "whisper-1"
+CONCEPT_MODEL = "gpt-4o-mini"
+CONCEPT_PROMPT_VERSION = "2"
+
+# Long transcripts are analyzed in parallel chunks and merged, instead of being truncated
+CONCEPT_CHUNK_CHARS = 12000
+CONCEPT_MAX_CHUNKS = 8
+
+CONCEPT_SYSTEM_PROMPT = (
+    "You are an educational content analyzer. Extract the main subject/topic, "
+    "5-10 key concepts, learning objectives, difficulty level and estimated "
+    "duration in minutes from educational video transcripts."
+)
+
+EXTRACTION_CACHE_DIR = os.getenv(
+    "EXTRACTION_CACHE_DIR", os.path.join(tempfile.gettempdir(), "vthacks-extraction-cache")
+)
+
+
+@lru_cache(maxsize=256)
+def _probe_video_info(video_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """ffprobe summary, memoized per file version so retries on the same upload skip the spawn."""
+    probe = ffmpeg.probe(video_path)
+    return {
+        "duration": float(probe['format']['duration']),
+        "size": int(probe['format']['size']),
+        "format": probe['format']['format_name'],
+        "streams": len(probe['streams'])
+    }
+
+
+def _split_transcript(transcript: str) -> List[str]:
+    """Split on word boundaries into at most CONCEPT_MAX_CHUNKS chunks of ~CONCEPT_CHUNK_CHARS."""
+    chunk_chars = max(CONCEPT_CHUNK_CHARS, -(-len(transcript) // CONCEPT_MAX_CHUNKS))
+    chunks, current, size = [], [], 0
+    for word in transcript.split():
+        if current and size + len(word) > chunk_chars:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+        current.append(word)
+        size += len(word) + 1
+    if current or not chunks:
+        chunks.append(" ".join(current))
+    return chunks
+
 
 class VideoProcessor:
     def __init__(self):
-        self.openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Async client: concurrent uploads share the event loop instead of each holding a worker thread
+        self.openai_client = openai.AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            # Pool sized for the concurrency cap, with keep-alive reuse across uploads
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=OPENAI_MAX_CONCURRENCY,
+                    max_keepalive_connections=OPENAI_MAX_CONCURRENCY
+                )
+            )
+        )
+        self._openai_semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+        self.extraction_cache = ExtractionCache(EXTRACTION_CACHE_DIR, schema=VideoExtractionResult)
         
     def extract_audio(self, video_path: str, return_info: bool = False) -> Union[str, Dict[str, Any]]:
         """Extract audio from video file using ffmpeg."""
@@ -20,21 +93,12 @@ class VideoProcessor:
             with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_audio:
                 audio_path = temp_audio.name
             
-            # Get video info first
-            probe = ffmpeg.probe(video_path)
-            video_info = {
-                "duration": float(probe['format']['duration']),
-                "size": int(probe['format']['size']),
-                "format": probe['format']['format_name'],
-                "streams": len(probe['streams'])
-            }
-            
             # Extract audio using ffmpeg-python
             # Optimized settings for speech-to-text APIs:
             # - 16kHz sample rate (optimal for speech recognition)
             # - mono channel (reduces file size)
             # - PCM 16-bit (uncompressed, high quality)
-            (
+            process = (
                 ffmpeg
                 .input(video_path)
                 .output(
@@ -44,9 +108,24 @@ class VideoProcessor:
                     ac=1                 # mono channel
                 )
                 .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
+                .run_async(pipe_stdout=True, pipe_stderr=True)
             )
             
+            # Probe the video while ffmpeg extracts, instead of before it starts
+            try:
+                video_info = None
+                if return_info:
+                    st = os.stat(video_path)
+                    video_info = dict(_probe_video_info(video_path, st.st_mtime_ns, st.st_size))
+            except BaseException:
+                process.kill()
+                process.communicate()
+                raise
+            
+            out, err = process.communicate()
+            if process.returncode:
+                raise ffmpeg.Error('ffmpeg', out, err)
+            
             # Get audio file info
             audio_size = os.path.getsize(audio_path)
             
@@ -74,15 +153,37 @@ class VideoProcessor:
                 detail=f"Audio extraction failed: {error_msg}"
             )
     
-    def transcribe_audio(self, audio_path: str) -> Dict[str, Any]:
-        """Transcribe audio using OpenAI Whisper API."""
+    def extract_audio_to_memory(self, video_path: str) -> io.BytesIO:
+        """Extract 16kHz mono WAV audio straight from ffmpeg's stdout, without a temp file."""
         try:
-            with open(audio_path, "rb") as audio_file:
-                transcript = self.openai_client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language="en"
-                )
+            out, _ = (
+                ffmpeg
+                .input(video_path)
+                .output('pipe:1', format='wav', acodec='pcm_s16le', ar=16000, ac=1)
+                .run(capture_stdout=True, capture_stderr=True)
+            )
+        except ffmpeg.Error as e:
+            error_msg = e.stderr.decode() if e.stderr else str(e)
+            raise HTTPException(
+                status_code=500, 
+                detail=f"Audio extraction failed: {error_msg}"
+            )
+        
+        audio = io.BytesIO(out)
+        audio.name = "audio.wav"  # The OpenAI SDK infers the upload format from the name
+        return audio
+    
+    async def transcribe_audio(self, audio: Union[str, BinaryIO]) -> Dict[str, Any]:
+        """Transcribe audio (a file path or a named file-like object) using OpenAI Whisper API."""
+        try:
+            with contextlib.ExitStack() as stack:
+                audio_file = stack.enter_context(open(audio, "rb")) if isinstance(audio, str) else audio
+                async with self._openai_semaphore:
+                    transcript = await self.openai_client.audio.transcriptions.create(
+                        model=TRANSCRIPTION_MODEL,
+                        file=audio_file,
+                        language="en"
+                    )
             
             return {
                 "text": transcript.text,
@@ -95,39 +196,45 @@ class VideoProcessor:
                 detail=f"Transcription failed: {str(e)}"
             )
     
-    def extract_concepts(self, transcript: str) -> Dict[str, Any]:
-        """Extract key concepts from transcript using GPT-4."""
-        try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
+    async def _parse_concepts(self, instructions: str, content: str) -> ConceptAnalysis:
+        """One structured-output call returning a validated ConceptAnalysis."""
+        async with self._openai_semaphore:
+            completion = await self.openai_client.chat.completions.parse(
+                model=CONCEPT_MODEL,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an educational content analyzer. Extract key concepts, topics, 
-                        and learning objectives from educational video transcripts. Return a structured analysis."""
-                    },
-                    {
-                        "role": "user",
-                        "content": f"""Analyze this educational video transcript and extract:
-                        1. Main subject/topic
-                        2. Key concepts (5-10 main ideas)
-                        3. Learning objectives
-                        4. Difficulty level (beginner/intermediate/advanced)
-                        5. Estimated duration in minutes
-                        
-                        Transcript: {transcript[:3000]}...
-                        
-                        Return as structured JSON."""
-                    }
+                    {"role": "system", "content": CONCEPT_SYSTEM_PROMPT},
+                    {"role": "user", "content": f"{instructions}\n\n{content}"}
                 ],
+                response_format=ConceptAnalysis,
                 temperature=0.3
             )
-            
-            # Parse the response - for now return a structured format
-            content = response.choices[0].message.content
+        message = completion.choices[0].message
+        if message.parsed is None:
+            raise ValueError(message.refusal or "No structured output returned")
+        return message.parsed
+    
+    async def extract_concepts(self, transcript: str) -> Dict[str, Any]:
+        """Extract key concepts from transcript (map-reduce over chunks when it is long)."""
+        try:
+            chunks = _split_transcript(transcript)
+            if len(chunks) == 1:
+                analysis = await self._parse_concepts("Analyze this educational video transcript.", f"Transcript: {transcript}")
+            else:
+                partials = await asyncio.gather(*(
+                    self._parse_concepts(
+                        f"Analyze part {i} of {len(chunks)} of an educational video transcript.",
+                        f"Transcript part: {chunk}"
+                    )
+                    for i, chunk in enumerate(chunks, start=1)
+                ))
+                analysis = await self._parse_concepts(
+                    "Merge these partial analyses of one video into a single analysis. "
+                    "Deduplicate concepts (keep 5-10), and estimate duration for the whole video.",
+                    "\n".join(partial.model_dump_json() for partial in partials)
+                )
             
             return {
-                "analysis": content,
+                "analysis": analysis.model_dump(),
                 "word_count": len(transcript.split()),
                 "estimated_duration": max(1, len(transcript.split()) // 150)  # ~150 words per minute
             }
@@ -138,28 +245,40 @@ class VideoProcessor:
                 detail=f"Concept extraction failed: {str(e)}"
             )
     
-    def process_video(self, video_path: str) -> Dict[str, Any]:
-        """Complete video processing pipeline."""
-        audio_path = None
+    async def process_video(self, video_path: str) -> Dict[str, Any]:
+        """Complete video processing pipeline (cached by video content)."""
         try:
-            # Step 1: Extract audio
-            audio_path = self.extract_audio(video_path)
+            # Identical uploads and client retries skip both OpenAI calls
+            video_hash = await asyncio.to_thread(hash_file, video_path)
+            cache_key = ExtractionCache.make_key(
+                "openai", TRANSCRIPTION_MODEL, CONCEPT_MODEL, CONCEPT_PROMPT_VERSION, video_hash
+            )
+            cached = await asyncio.to_thread(self.extraction_cache.get, cache_key)
+            if cached is not None:
+                return cached
+            
+            # Step 1: Extract audio (in memory, no temp WAV to write and re-read)
+            audio = await asyncio.to_thread(self.extract_audio_to_memory, video_path)
             
             # Step 2: Transcribe audio
-            transcript_data = self.transcribe_audio(audio_path)
+            transcript_data = await self.transcribe_audio(audio)
             
             # Step 3: Extract concepts
-            concepts_data = self.extract_concepts(transcript_data["text"])
+            concepts_data = await self.extract_concepts(transcript_data["text"])
             
-            return {
+            result = {
                 "transcript": transcript_data,
                 "concepts": concepts_data,
                 "status": "success"
             }
+            try:
+                await asyncio.to_thread(self.extraction_cache.put, cache_key, result)
+            except Exception as e:
+                # The result is already computed; a failed cache write (e.g. full disk) only costs a future miss
+                logger.warning("Could not cache extraction result: %s", e)
+            return result
             
         finally:
             # Cleanup temporary files
-            if audio_path and os.path.exists(audio_path):
-                os.unlink(audio_path)
-            if os.path.exists(video_path):
+            with contextlib.suppress(FileNotFoundError):
                 os.unlink(video_path)
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+One-off migration: claim USERNAME#<username> sentinel rows for existing users.
+Run once before deploying transactional signup. Safe to re-run.
+Usage: python migrate_username_sentinels.py
+"""
+import os
+import sys
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Add the image/src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'image', 'src'))
+
+from utils.dynamodb_client import DynamoDBClient
+
+if __name__ == "__main__":
+    db_client = DynamoDBClient()
+    print(f"🔄 Backfilling username sentinels in {db_client.users_table_name}...")
+    claimed = db_client.backfill_username_sentinels()
+    print(f"✅ Claimed {claimed} username(s)")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Check the DynamoDB requests the client puts on the wire, without AWS.
+Usage: python test_dynamodb_client.py
+"""
+import json
+import os
+import sys
+
+from botocore.stub import Stubber
+
+# Stubbed calls still sign requests, so any credentials will do
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+# Add the image/src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'image', 'src'))
+
+from utils.dynamodb_client import DynamoDBClient
+
+SIGNUP = {
+    'username': 'ada',
+    'name': 'Ada',
+    'password_hash': 'hash',
+    'age': 20,
+    'academic_level': 'undergraduate',
+    'major': 'CS',
+}
+
+
+def capture_wire_bodies(client, operation):
+    """Collect the JSON bodies botocore serializes for one operation (after any boto3 transforms)."""
+    bodies = []
+
+    def capture(params, model, **kwargs):
+        if model.name == operation:
+            bodies.append(json.loads(params['body']))
+
+    # Same event pattern as Stubber's response handler, but registered first so it sees the request
+    client.meta.events.register_first('before-call.*.*', capture)
+    return bodies
+
+
+def test_create_user_sends_single_serialized_items():
+    """Each attribute is one AttributeValue deep on the wire (not {"M": {"S": {"S": ...}}})."""
+    db = DynamoDBClient()
+    client = db.client
+    bodies = capture_wire_bodies(client, 'TransactWriteItems')
+    with Stubber(client) as stubber:
+        stubber.add_response('transact_write_items', {})
+        user = db.create_user(SIGNUP)
+        stubber.assert_no_pending_responses()
+
+    user_put, sentinel_put = (entry['Put'] for entry in bodies[0]['TransactItems'])
+    assert user_put['Item']['userId'] == {'S': user['userId']}
+    assert user_put['Item']['username'] == {'S': 'ada'}
+    assert user_put['Item']['preferences']['M']['age'] == {'N': '20'}
+    assert user_put['Item']['preferences']['M']['learningStyles'] == {'L': []}
+    assert user_put['ConditionExpression'] == 'attribute_not_exists(userId)'
+    assert sentinel_put['Item'] == {'userId': {'S': 'USERNAME#ada'}, 'ownerId': {'S': user['userId']}}
+    assert sentinel_put['ConditionExpression'] == 'attribute_not_exists(userId)'
+
+
+def test_get_user_by_username_resolves_through_sentinel():
+    """Sentinel get_item, then the owner row, deserialized back to plain Python values."""
+    db = DynamoDBClient()
+    with Stubber(db.client) as stubber:
+        stubber.add_response(
+            'get_item',
+            {'Item': {'ownerId': {'S': 'user-1'}}},
+            {
+                'TableName': db.users_table_name,
+                'Key': {'userId': {'S': 'USERNAME#ada'}},
+                'ProjectionExpression': 'ownerId',
+                'ConsistentRead': True,
+            }
+        )
+        stubber.add_response(
+            'get_item',
+            {'Item': {
+                'userId': {'S': 'user-1'},
+                'username': {'S': 'ada'},
+                'preferences': {'M': {'age': {'N': '20'}, 'learningStyles': {'L': [{'S': 'visual'}]}}},
+            }},
+            {'TableName': db.users_table_name, 'Key': {'userId': {'S': 'user-1'}}}
+        )
+        user = db.get_user_by_username('ada')
+        stubber.assert_no_pending_responses()
+
+    assert user['username'] == 'ada'
+    assert user['preferences']['age'] == 20
+    assert user['preferences']['learningStyles'] == ['visual']
+
+
+if __name__ == "__main__":
+    test_create_user_sends_single_serialized_items()
+    test_get_user_by_username_resolves_through_sentinel()
+    print("✅ DynamoDB wire-shape checks passed")